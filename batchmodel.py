@@ -0,0 +1,535 @@
+import numpy as np
+import pandas as pd
+from originalmodel import compound_factors, ModelInputs, DEFAULT_ASSUMPTIONS, utilization_factors
+
+# project_data.csv columns read by the batch models (the same fields as the scalar models' ModelInputs record)
+INPUT_COLUMNS = ModelInputs._fields
+
+#################################################################BATCH PROCESS MODEL BEGINS#########################################################################
+
+def _column(data, key):
+    """
+    Returns an input column as a float64 array that broadcasts against an (N, project_life) matrix.
+    Scalars apply to every scenario, 1-D inputs hold one value per scenario and 2-D inputs hold one value per scenario and year.
+    """
+    values = np.asarray(data[key], dtype=np.float64)
+    if values.ndim == 0:
+        return values.reshape(1, 1)
+    if values.ndim == 1:
+        return values[:, None]
+    return values
+
+
+def ChemProcess_Batch(data, assumptions=None):
+    """
+    Vectorized ChemProcess_Model. `data` is any column mapping (a DataFrame, a dict of arrays, ...)
+    holding the project_data.csv inputs for N scenarios; every output is an (N, project_life) array.
+    All N scenarios share one ModelAssumptions set (the defaults when None).
+    """
+    if assumptions is None:
+        assumptions = DEFAULT_ASSUMPTIONS
+
+    EcNatGas = assumptions.EcNatGas
+
+    ngCcontnt = assumptions.ngCcontnt
+
+    hEFF = assumptions.hEFF
+    eEFF = assumptions.eEFF
+
+    util_fac = utilization_factors(assumptions)
+
+    Yld = _column(data, 'Yld')
+
+    prodQ = util_fac * _column(data, 'Cap')
+
+    feedQ = prodQ / Yld
+
+    fuelgas = _column(data, 'feedEcontnt') * (1 - Yld) * feedQ
+
+    Rheat = _column(data, 'Heat_req') * (prodQ / hEFF)
+
+    dHF = Rheat - fuelgas
+    netHeat = np.maximum(0, dHF)
+
+    Relec = _column(data, 'Elect_req') * (prodQ / eEFF)
+
+    ghg_dir = (fuelgas * _column(data, 'feedCcontnt')) + (dHF * ngCcontnt / 1000)
+
+    ghg_ind = Relec * ngCcontnt / 1000
+
+    shape = np.broadcast_shapes(prodQ.shape, feedQ.shape, ghg_dir.shape, Relec.shape)
+    return tuple(np.broadcast_to(x, shape) for x in (prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind))
+
+#################################################################BATCH PROCESS MODEL ENDS###########################################################################
+
+
+#################################################################BATCH MICROECONOMIC MODEL BEGINS###################################################################
+
+def bank_charge_recurrence_batch(NetRevn, bank_chrg, RR, construction_prd):
+    """
+    Batched originalmodel.bank_charge_recurrence over (N, project_life) arrays. The recurrence is sequential in time,
+    so it steps once per operating year with running sums and vectorizes across scenarios. Returns a new array.
+    """
+    bank_chrg = np.array(bank_chrg, dtype=np.float64)
+    NetRevn_to_date = np.cumsum(NetRevn, axis=1)
+    chrg_to_date = bank_chrg[:, :construction_prd].sum(axis=1)
+    for i in range(construction_prd + 1, bank_chrg.shape[1]):
+        balance = NetRevn_to_date[:, i - 1] - chrg_to_date
+        chrg_to_date = chrg_to_date + bank_chrg[:, i - 1]
+        bank_chrg[:, i] = np.where(balance < 0, RR * np.abs(balance), 0)
+    return bank_chrg
+
+
+def depreciated_tax_batch(NetRevn, corpTAX, deprCAPEX):
+    """
+    Green-field tax schedule: positive net revenue first writes off the depreciable CAPEX (deprCAPEX, one value
+    per scenario) and is taxed at corpTAX once the asset is fully depreciated.
+    """
+    N, project_life = NetRevn.shape
+    tax_pybl = np.zeros((N, project_life))
+    depr_asst = np.zeros(N)
+    for i in range(project_life):
+        net = NetRevn[:, i]
+        total = net + depr_asst
+        open_ = (net > 0) & (depr_asst < deprCAPEX)
+        absorb = open_ & (total <= deprCAPEX)
+        exceed = open_ & (total > deprCAPEX)
+        taxed = (net > 0) & ~open_
+        tax_pybl[:, i] = np.where(exceed, (total - deprCAPEX) * corpTAX[:, i], np.where(taxed, net * corpTAX[:, i], 0))
+        depr_asst = np.where(absorb, total, np.where(exceed, depr_asst + (deprCAPEX - depr_asst), depr_asst))
+    return tax_pybl
+
+
+def MicroEconomic_Batch(data, plant_mode, fund_mode, opex_mode, carbon_value, process=None, assumptions=None):
+    """
+    Vectorized MicroEconomic_Model for N scenarios sharing the same plant/fund/opex/carbon modes.
+
+    Returns the same tuple as MicroEconomic_Model, with per-scenario values as (N,) arrays
+    (Ps, Pso, Pc, Pco and the cost-contribution split) and yearly series as (N, project_life) arrays.
+    `process` takes precomputed ChemProcess_Batch outputs.
+    """
+    if assumptions is None:
+        assumptions = DEFAULT_ASSUMPTIONS
+    if process is None:
+        process = ChemProcess_Batch(data, assumptions)
+    prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind = process
+    N = prodQ.shape[0]
+    elEFF = assumptions.elEFF
+
+    Infl = assumptions.infl
+    RR = assumptions.RR
+    IRR = assumptions.IRR
+
+    shrDebt = assumptions.shrDebt
+    wacc = assumptions.wacc
+
+    construction_prd = assumptions.construction_prd
+    operating_prd = assumptions.operating_prd
+    project_life = assumptions.project_life
+
+    years = np.arange(project_life)
+    baseYear = np.asarray(data['Base_Yr']).reshape(-1, 1).astype(np.int64)
+    Year = np.broadcast_to(baseYear + years, (N, project_life))
+
+    capex_spread = np.array(assumptions.capex_spread)
+
+    OwnerCost = assumptions.ownerCost
+
+    corpTAX = np.zeros((N, project_life))
+    corpTAX[:] = _column(data, 'corpTAX')
+    corpTAX[:, :construction_prd] = 0
+
+    credit = assumptions.credit
+
+    inflation = compound_factors(Infl, project_life)
+    if opex_mode == "Inflated":
+        price_factor = inflation
+    else:
+        price_factor = np.ones(project_life)
+
+    feedcst = feedQ * (_column(data, "Feed_Price") * price_factor)
+    fuelcst = netHeat * (_column(data, "Fuel_Price") * price_factor)
+    eleccst = elEFF * Relec * (_column(data, "Elect_Price") * price_factor)
+
+    if carbon_value == "Yes":
+        CO2cst = _column(data, "CO2price") * ghg_dir
+    else:
+        CO2cst = np.zeros((N, project_life))
+
+    capex = np.zeros((N, project_life))
+    capex[:, :construction_prd] = capex_spread * _column(data, "CAPEX")
+    opex = np.zeros((N, project_life))
+    opex[:, construction_prd:] = (_column(data, "OPEX") + feedcst + fuelcst + eleccst + CO2cst)[:, construction_prd:]
+
+    Yrly_invsmt = capex + opex
+
+    if fund_mode == "Debt":
+        bank_rate = RR
+        disc_rate = IRR
+    elif fund_mode == "Equity":
+        bank_rate = 0
+        disc_rate = IRR
+    else:
+        bank_rate = RR * shrDebt
+        disc_rate = wacc
+
+    # Construction-period charges accrue on the cumulative investment up to year construction_prd + 1,
+    # later years keep the charge on the investment up to construction_prd.
+    chrg_idx = np.where(years <= (construction_prd + 1), years, construction_prd)
+    bank_chrg = bank_rate * np.cumsum(Yrly_invsmt, axis=1)[:, chrg_idx]
+
+    deprCAPEX = (1-OwnerCost) * Yrly_invsmt[:, :construction_prd].sum(axis=1)
+
+    if plant_mode != "Green":
+        bank_chrg = np.zeros((N, project_life))
+        Yrly_invsmt[:, :construction_prd] = 0
+
+    discount = compound_factors(disc_rate, project_life)
+    Yrly_cost = Yrly_invsmt + bank_chrg
+
+    cshflw = Yrly_cost * (1 - corpTAX) / discount
+    dctftr = (prodQ * (1 - corpTAX) * inflation) / discount
+    Pstaro = cshflw.sum(axis=1) / dctftr.sum(axis=1)
+    Rstark = (Pstaro[:, None] * inflation) * prodQ
+
+    NetRevn = Rstark - Yrly_cost
+
+    if fund_mode == "Debt" or (fund_mode != "Equity" and plant_mode == "Green"):
+        bank_chrg = bank_charge_recurrence_batch(NetRevn, bank_chrg, RR, construction_prd)
+
+    if plant_mode == "Green":
+        tax_pybl = depreciated_tax_batch(NetRevn, corpTAX, deprCAPEX)
+    else:
+        tax_pybl = np.where(NetRevn > 0, NetRevn * corpTAX, 0)
+
+    cshflw = (Yrly_invsmt + bank_chrg + tax_pybl) / discount
+    cshflw2 = (Yrly_invsmt + bank_chrg + tax_pybl * (1 - credit)) / discount
+    dctftr = prodQ / discount
+    dctftr2 = prodQ * inflation / discount
+
+    Ps = cshflw.sum(axis=1) / dctftr.sum(axis=1)
+    Pso = cshflw.sum(axis=1) / dctftr2.sum(axis=1)
+    Pc = cshflw2.sum(axis=1) / dctftr.sum(axis=1)
+    Pco = cshflw2.sum(axis=1) / dctftr2.sum(axis=1)
+
+    # Cost contributions are always discounted at IRR, also for Mixed funding
+    irr_discount = compound_factors(IRR, project_life)
+    ContrDenom = (prodQ / irr_discount).sum(axis=1)
+    capexContr = (capex / irr_discount).sum(axis=1) / ContrDenom
+    opexContr = (opex / irr_discount).sum(axis=1) / ContrDenom
+    feedContr = (feedcst / irr_discount).sum(axis=1) / ContrDenom
+    utilContr = ((eleccst + fuelcst) / irr_discount).sum(axis=1) / ContrDenom
+    bankContr = (bank_chrg / irr_discount).sum(axis=1) / ContrDenom
+    taxContr = (tax_pybl / irr_discount).sum(axis=1) / ContrDenom
+    otherContr = Ps - (capexContr + opexContr + feedContr + utilContr + bankContr + taxContr)
+
+    return Ps, Pso, Pc, Pco, capexContr, opexContr, feedContr, utilContr, bankContr, taxContr, otherContr, cshflw, cshflw2, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, NetRevn, tax_pybl
+
+#################################################################BATCH MICROECONOMIC MODEL ENDS#####################################################################
+
+
+#################################################################SENSITIVITY ANALYSIS BEGINS########################################################################
+
+SENSITIVITY_PARAMETERS = ("Feed_Price", "CAPEX", "OPEX", "Elect_Price", "Fuel_Price", "CO2price", "Yld", "corpTAX")
+
+
+def validate_sensitivity(parameters, change):
+    """Checks Sensitivity_Analysis arguments before any model runs; raises ValueError describing the first problem found"""
+    unknown = [p for p in parameters if p not in INPUT_COLUMNS or p == "Base_Yr"]
+    if unknown:
+        raise ValueError(f"Unsupported sensitivity parameters: {unknown}")
+    if not 0 < change < 1:
+        raise ValueError("change must be between 0 and 1")
+
+
+def Sensitivity_Analysis(data, plant_mode, fund_mode, opex_mode, carbon_value, parameters=SENSITIVITY_PARAMETERS, change=0.10,
+                         assumptions=None):
+    """
+    Tornado table of the Constant$ Breakeven Price (Ps) for a single project row.
+
+    Every parameter is moved by -change and +change (relative) one at a time; the base case and all
+    perturbations go through MicroEconomic_Batch as one vectorized batch, without the macro stage.
+    Rows are sorted by swing, the largest impact first.
+    """
+    validate_sensitivity(parameters, change)
+
+    n_cases = 1 + 2 * len(parameters)
+    columns = {key: np.full(n_cases, data[key], dtype=np.float64) for key in INPUT_COLUMNS}
+    for k, parameter in enumerate(parameters):
+        columns[parameter][1 + 2 * k] *= (1 - change)
+        columns[parameter][2 + 2 * k] *= (1 + change)
+
+    Ps = MicroEconomic_Batch(columns, plant_mode, fund_mode, opex_mode, carbon_value, assumptions=assumptions)[0]
+    base = Ps[0]
+    low = Ps[1::2]
+    high = Ps[2::2]
+
+    table = pd.DataFrame({
+        'Parameter': list(parameters),
+        'Base Value': [float(data[p]) for p in parameters],
+        'Low Value': [columns[p][1 + 2 * k] for k, p in enumerate(parameters)],
+        'High Value': [columns[p][2 + 2 * k] for k, p in enumerate(parameters)],
+        'Base Breakeven Price': base,
+        'Low Breakeven Price': low,
+        'High Breakeven Price': high,
+        'Low Change (%)': (low - base) / base * 100,
+        'High Change (%)': (high - base) / base * 100,
+        'Swing': np.abs(high - low),
+    })
+    return table.sort_values('Swing', ascending=False, kind='stable').reset_index(drop=True)
+
+#################################################################SENSITIVITY ANALYSIS ENDS##########################################################################
+
+
+#################################################################MONTE CARLO ANALYSIS BEGINS########################################################################
+
+# Parameters each supported distribution spec must provide
+DISTRIBUTION_PARAMETERS = {
+    "normal": ("mean", "sd"),
+    "uniform": ("low", "high"),
+    "triangular": ("low", "mode", "high"),
+    "lognormal": ("mean", "sigma"),
+}
+
+
+def validate_distribution(spec):
+    """Checks a distribution spec before sampling; raises ValueError describing the first problem found"""
+    if not isinstance(spec, dict):
+        raise ValueError("a distribution spec must be an object")
+    dist = spec.get("dist", "normal")
+    if dist not in DISTRIBUTION_PARAMETERS:
+        raise ValueError(f"Unsupported distribution: {dist}")
+    for name in DISTRIBUTION_PARAMETERS[dist]:
+        if name not in spec:
+            raise ValueError(f"{dist} distribution requires '{name}'")
+        value = spec[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+            raise ValueError(f"'{name}' must be a finite number")
+    if dist == "normal" and spec["sd"] < 0:
+        raise ValueError("'sd' must not be negative")
+    if dist == "lognormal" and spec["sigma"] < 0:
+        raise ValueError("'sigma' must not be negative")
+    if dist == "uniform" and spec["low"] > spec["high"]:
+        raise ValueError("'low' must not exceed 'high'")
+    if dist == "triangular" and not (spec["low"] <= spec["mode"] <= spec["high"] and spec["low"] < spec["high"]):
+        raise ValueError("triangular distribution requires low <= mode <= high and low < high")
+
+
+def validate_montecarlo(distributions, n_draws, chunk_size):
+    """Checks MonteCarlo_Analysis arguments before any sampling; raises ValueError describing the first problem found"""
+    unknown = [p for p in distributions if p not in INPUT_COLUMNS or p == "Base_Yr"]
+    if unknown:
+        raise ValueError(f"Unsupported Monte Carlo parameters: {unknown}")
+    if n_draws <= 0:
+        raise ValueError("n_draws must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    for parameter, spec in distributions.items():
+        try:
+            validate_distribution(spec)
+        except ValueError as e:
+            raise ValueError(f"Invalid distribution spec for {parameter}: {e}") from None
+
+
+def _sample(rng, spec, size):
+    """Draws `size` values from a distribution spec such as {"dist": "normal", "mean": 700, "sd": 50}"""
+    dist = spec.get("dist", "normal")
+    if dist == "normal":
+        return rng.normal(spec["mean"], spec["sd"], size)
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    if dist == "lognormal":
+        # mean and sigma of the underlying normal distribution
+        return rng.lognormal(spec["mean"], spec["sigma"], size)
+    raise ValueError(f"Unsupported distribution: {dist}")
+
+
+def MonteCarlo_Analysis(data, plant_mode, fund_mode, opex_mode, carbon_value, distributions, n_draws=100000,
+                        chunk_size=20000, seed=None, percentiles=(10, 50, 90), max_paths=20000, assumptions=None):
+    """
+    Monte Carlo uncertainty analysis of the breakeven prices for a single project row.
+
+    `distributions` maps project_data.csv inputs to distribution specs (normal: mean/sd, uniform: low/high,
+    triangular: low/mode/high, lognormal: mean/sigma of the underlying normal); the other inputs stay at their
+    values in `data`. Draws go through ChemProcess_Batch + MicroEconomic_Batch in chunks of `chunk_size`, so
+    memory is bounded by the chunk size plus one float per draw for each breakeven price. Cumulative cash-flow
+    percentiles use the first `max_paths` draws. Every input has its own random stream derived from `seed`,
+    so results are reproducible.
+
+    Returns (summary, cashflows): percentiles/mean/std of Ps and Pc, and yearly percentiles of the real and
+    nominal cumulative cash flows.
+    """
+    validate_montecarlo(distributions, n_draws, chunk_size)
+
+    if assumptions is None:
+        assumptions = DEFAULT_ASSUMPTIONS
+    Infl = assumptions.infl
+    streams = dict(zip(distributions, (np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(distributions)))))
+
+    Ps_draws = np.empty(n_draws)
+    Pc_draws = np.empty(n_draws)
+    real_paths = []
+    nominal_paths = []
+    n_paths = 0
+
+    for start in range(0, n_draws, chunk_size):
+        size = min(chunk_size, n_draws - start)
+        columns = {key: np.full(size, data[key], dtype=np.float64) for key in INPUT_COLUMNS}
+        for parameter, spec in distributions.items():
+            columns[parameter] = _sample(streams[parameter], spec, size)
+
+        process = ChemProcess_Batch(columns, assumptions)
+        Ps, Pso, Pc, Pco, *_, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, NetRevn, tax_pybl = \
+            MicroEconomic_Batch(columns, plant_mode, fund_mode, opex_mode, carbon_value, process=process, assumptions=assumptions)
+        Ps_draws[start:start + size] = Ps
+        Pc_draws[start:start + size] = Pc
+
+        if n_paths < max_paths:
+            keep = min(size, max_paths - n_paths)
+            prodQ = process[0][:keep]
+            Yrly_cost = Yrly_invsmt[:keep] + bank_chrg[:keep]
+            inflation = compound_factors(Infl, project_life)
+            real_paths.append(np.cumsum(Ps[:keep, None] * prodQ - Yrly_cost, axis=1))
+            nominal_paths.append(np.cumsum(Pso[:keep, None] * inflation * prodQ - Yrly_cost, axis=1))
+            n_paths += keep
+
+    labels = [f"P{p}" for p in percentiles]
+    summary = pd.DataFrame(
+        [list(np.percentile(x, percentiles)) + [x.mean(), x.std()] for x in (Ps_draws, Pc_draws)],
+        index=['Constant$ Breakeven Price', 'Constant$ SC wCredit'],
+        columns=labels + ['Mean', 'Std']
+    )
+
+    cashflows = {'Year': Year[0]}
+    for name, paths in (('Real cumCash Flow', real_paths), ('Nominal cumCash Flow', nominal_paths)):
+        for label, values in zip(labels, np.percentile(np.concatenate(paths), percentiles, axis=0)):
+            cashflows[f'{name} {label}'] = values
+    return summary, pd.DataFrame(cashflows)
+
+#################################################################MONTE CARLO ANALYSIS ENDS##########################################################################
+
+
+#################################################################BREAKEVEN SOLVER BEGINS############################################################################
+
+def Breakeven_Solver(data, opex_mode, carbon_value, fund_mode="Debt", method="fixed_point", tol=1e-10, max_iter=100, assumptions=None):
+    """
+    Self-consistent breakeven prices for Green-field Debt (or Mixed) projects.
+
+    MicroEconomic_Model prices revenue at a tax-free estimate (Pstaro), derives NetRevn with the construction-period
+    bank charges and takes Ps after one tax/depreciation pass. Here revenue is priced at a trial current$ price P;
+    bank charges and NetRevn are resolved year by year so NetRevn carries the bank charges actually paid, and the
+    resulting Pso(P) is driven to P, starting from the one-pass Pso:
+
+      method="fixed_point"  iterates P <- Pso(P); Pso moves by less than P (tax rate < 1), so this contracts.
+      method="bracket"      brackets the root of Pso(P) - P in [0, hi] and refines it with the Illinois method.
+
+    Each iteration is one vectorized evaluation across all scenarios. Returns a DataFrame with the one-pass and
+    converged Ps, the converged Pso/Pc/Pco, the number of evaluations per scenario, the relative residual
+    |Pso(P) - P| / |Pso(P)| and whether it reached `tol`.
+    """
+    if fund_mode not in ("Debt", "Mixed"):
+        raise ValueError("Breakeven_Solver handles the Debt and Mixed fund modes")
+    if method not in ("fixed_point", "bracket"):
+        raise ValueError(f"Unsupported solver method: {method}")
+
+    if assumptions is None:
+        assumptions = DEFAULT_ASSUMPTIONS
+    process = ChemProcess_Batch(data, assumptions)
+    prodQ = process[0]
+    Ps_onepass, Pso_onepass, _, _, *_, project_life, construction_prd, Yrly_invsmt, bank_chrg, _, _ = \
+        MicroEconomic_Batch(data, "Green", fund_mode, opex_mode, carbon_value, process=process, assumptions=assumptions)
+    N = prodQ.shape[0]
+
+    Infl = assumptions.infl
+    RR = assumptions.RR
+    IRR = assumptions.IRR
+    wacc = assumptions.wacc
+    OwnerCost = assumptions.ownerCost
+    credit = assumptions.credit
+
+    inflation = compound_factors(Infl, project_life)
+    discount = compound_factors(IRR if fund_mode == "Debt" else wacc, project_life)
+    corpTAX = np.zeros((N, project_life))
+    corpTAX[:] = _column(data, 'corpTAX')
+    corpTAX[:, :construction_prd] = 0
+    deprCAPEX = (1-OwnerCost) * Yrly_invsmt[:, :construction_prd].sum(axis=1)
+    dctftr = (prodQ / discount).sum(axis=1)
+    dctftr2 = (prodQ * inflation / discount).sum(axis=1)
+
+    def evaluate(P):
+        Rstark = (P[:, None] * inflation) * prodQ
+        chrg = np.array(bank_chrg)
+        NetRevn = np.empty((N, project_life))
+        NetRevn[:, :construction_prd + 1] = Rstark[:, :construction_prd + 1] - (Yrly_invsmt + chrg)[:, :construction_prd + 1]
+        NetRevn_to_date = NetRevn[:, :construction_prd + 1].sum(axis=1)
+        chrg_to_date = chrg[:, :construction_prd].sum(axis=1)
+        for i in range(construction_prd + 1, project_life):
+            balance = NetRevn_to_date - chrg_to_date
+            chrg_to_date = chrg_to_date + chrg[:, i - 1]
+            chrg[:, i] = np.where(balance < 0, RR * np.abs(balance), 0)
+            NetRevn[:, i] = Rstark[:, i] - (Yrly_invsmt[:, i] + chrg[:, i])
+            NetRevn_to_date = NetRevn_to_date + NetRevn[:, i]
+        tax_pybl = depreciated_tax_batch(NetRevn, corpTAX, deprCAPEX)
+        cshflw = ((Yrly_invsmt + chrg + tax_pybl) / discount).sum(axis=1)
+        cshflw2 = ((Yrly_invsmt + chrg + tax_pybl * (1 - credit)) / discount).sum(axis=1)
+        return cshflw / dctftr, cshflw / dctftr2, cshflw2 / dctftr, cshflw2 / dctftr2
+
+    def relative(gap, scale):
+        return np.abs(gap) / np.maximum(np.abs(scale), np.finfo(float).tiny)
+
+    iterations = np.zeros(N, dtype=np.int64)
+    P = np.array(Pso_onepass, dtype=np.float64)
+
+    if method == "fixed_point":
+        for _ in range(max_iter):
+            Pso = evaluate(P)[1]
+            iterations += 1
+            converged = relative(Pso - P, Pso) <= tol
+            P = np.where(converged, P, Pso)
+            if converged.all():
+                break
+    else:
+        lo = np.zeros(N)
+        f_lo = evaluate(lo)[1] - lo
+        hi = np.maximum(2 * np.abs(P), 1.0)
+        f_hi = evaluate(hi)[1] - hi
+        iterations += 2
+        for _ in range(max_iter):
+            expand = f_hi > 0
+            if not expand.any():
+                break
+            hi = np.where(expand, 2 * hi, hi)
+            f_hi = np.where(expand, evaluate(hi)[1] - hi, f_hi)
+            iterations += expand
+        P = hi
+        for _ in range(max_iter):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+            x = np.where(np.isfinite(x), x, (lo + hi) / 2)
+            fx = evaluate(x)[1] - x
+            active = relative(f_hi, hi) > tol
+            iterations += active
+            same_side = np.sign(fx) == np.sign(f_hi)
+            lo, f_lo = np.where(active & ~same_side, hi, lo), np.where(active & ~same_side, f_hi, np.where(active, f_lo / 2, f_lo))
+            hi, f_hi = np.where(active, x, hi), np.where(active, fx, f_hi)
+            P = hi
+            if not (relative(f_hi, hi) > tol).any():
+                break
+
+    Ps, Pso, Pc, Pco = evaluate(P)
+    residual = relative(Pso - P, Pso)
+    return pd.DataFrame({
+        'One-pass Ps': Ps_onepass,
+        'Ps': Ps,
+        'Pso': Pso,
+        'Pc': Pc,
+        'Pco': Pco,
+        'Ps Gap (%)': (Ps_onepass - Ps) / Ps * 100,
+        'Iterations': iterations,
+        'Residual': residual,
+        'Converged': residual <= tol,
+    })
+
+#################################################################BREAKEVEN SOLVER ENDS##############################################################################
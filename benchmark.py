@@ -0,0 +1,183 @@
+"""
+Benchmark suite for the model stages and the /analyze endpoint.
+
+Every case is timed call by call after a warm-up; latency percentiles, throughput and the peak traced memory of one
+extra call are written to a JSON file. With --baseline the results are compared against an earlier run and the
+script exits with status 1 when a case's median latency regressed by more than --threshold.
+
+    python benchmark.py                                   # run and write benchmark_results.json
+    python benchmark.py --baseline benchmark_baseline.json
+    python benchmark.py --only micro --repeat 200
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from originalmodel import (ChemProcess_Model, MicroEconomic_Model, MacroEconomic_Model, MacroEconomic_Model_Countries, Analytics_Model2,
+                           build_multiplier_index, build_multiplier_tensor)
+
+PROJECT_DATA_FILE = "./project_data.csv"
+MULTIPLIERS_FILE = "./sectorwise_multipliers.csv"
+PERCENTILES = (50, 90, 99)
+
+# /analyze payload matching the first project_data.csv row and the default model assumptions
+ANALYZE_PAYLOAD = {
+    "location": "CAN", "plant_mode": "Green", "fund_mode": "Mixed", "opex_mode": "Inflated", "carbon_value": "Yes",
+    "operating_prd": 27, "util_operating_first": 0.7, "util_operating_second": 0.8, "util_operating_third": 0.95,
+    "infl": 0.02, "RR": 0.035, "IRR": 0.10, "construction_prd": 3, "capex_spread": [0.2, 0.5, 0.3], "shrDebt_value": 0.6,
+    "baseYear": 2025, "ownerCost": 0.1, "corpTAX_value": 0.27, "Feed_Price": 88.5, "Fuel_Price": 88.5, "Elect_Price": 16.92,
+    "CarbonTAX_value": 56.34, "credit_value": 0.1, "CAPEX": 1020000000, "OPEX": 19600000, "PRIcoef": 0.3, "CONcoef": 0.7,
+    "EcNatGas": 53.6, "ngCcontnt": 50.3, "eEFF": 0.5, "hEFF": 0.8, "Cap": 1600000, "Yld": 0.875, "feedEcontnt": 53.6,
+    "Heat_req": 11.6, "Elect_req": 0.3, "feedCcontnt": 50,
+}
+
+
+def model_cases(project_data, multipliers, repeat):
+    """(name, callable, repeat) for every benchmarked model call"""
+    row = project_data.iloc[0]
+    single = project_data.iloc[[0]]
+    index = build_multiplier_index(multipliers)
+    tensor = build_multiplier_tensor(index)
+    cases = [("process/ChemProcess_Model", lambda: ChemProcess_Model(row), repeat)]
+    for fund_mode in ("Debt", "Equity", "Mixed"):
+        for plant_mode in ("Green", "Brown"):
+            cases.append((f"micro/MicroEconomic_Model[{fund_mode},{plant_mode}]",
+                          lambda f=fund_mode, p=plant_mode: MicroEconomic_Model(row, p, f, "Inflated", "Yes"), repeat))
+    cases += [
+        ("macro/MacroEconomic_Model", lambda: MacroEconomic_Model(index, row, row["Country"], "Green", "Mixed", "Inflated", "Yes"), repeat),
+        ("macro/MacroEconomic_Model_Countries[all]",
+         lambda: MacroEconomic_Model_Countries(tensor, row, tensor.countries, "Green", "Mixed", "Inflated", "Yes"), repeat),
+        ("analytics/Analytics_Model2[1 row]",
+         lambda: Analytics_Model2(multipliers, single, row["Country"], None, "Green", "Mixed", "Inflated", "Yes", None, None), repeat),
+        # All 80 rows, one country filter at a time, as a full-table run would
+        ("analytics/Analytics_Model2[80 rows]",
+         lambda: [Analytics_Model2(index, project_data, country, None, "Green", "Mixed", "Inflated", "Yes", None, None)
+                  for country in project_data["Country"].unique()], max(repeat // 20, 3)),
+    ]
+    return cases
+
+
+def api_cases(repeat):
+    """/analyze end to end through FastAPI's TestClient, with the result cache disabled so every call runs the model"""
+    os.environ.setdefault("IPEM_CACHE_SIZE", "0")
+    from fastapi.testclient import TestClient
+    import modelapi
+
+    client = TestClient(modelapi.app)
+    client.__enter__()
+
+    def analyze():
+        response = client.post("/analyze", json=ANALYZE_PAYLOAD)
+        response.raise_for_status()
+
+    return [("api/POST /analyze", analyze, repeat)], lambda: client.__exit__(None, None, None)
+
+
+def measure(func, repeat, warmup):
+    """Latency percentiles (ms), throughput (calls/s) and peak traced memory (MiB) of one call"""
+    for _ in range(warmup):
+        func()
+    gc.collect()
+    timings = np.empty(repeat)
+    started = time.perf_counter()
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"repeat": repeat}
+    for p, value in zip(PERCENTILES, np.percentile(timings, PERCENTILES)):
+        result[f"p{p}_ms"] = value * 1000
+    result["mean_ms"] = timings.mean() * 1000
+    result["throughput_per_s"] = repeat / elapsed
+    result["peak_memory_mib"] = peak / 2**20
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Cases whose median latency grew by more than `threshold` (relative) against the baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("cases", {}).get(name)
+        if before is None:
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1
+        result["p50_change_vs_baseline"] = change
+        if change > threshold:
+            regressions.append((name, before["p50_ms"], result["p50_ms"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the model stages and the /analyze endpoint")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed relative p50 slowdown (default: 0.20)")
+    parser.add_argument("--repeat", type=int, default=100, help="timed calls per case (the 80-row case runs repeat/20)")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--skip-api", action="store_true", help="leave out the /analyze TestClient case")
+    args = parser.parse_args(argv)
+
+    project_data = pd.read_csv(PROJECT_DATA_FILE)
+    multipliers = pd.read_csv(MULTIPLIERS_FILE)
+    cases = model_cases(project_data, multipliers, args.repeat)
+    close = None
+    if not args.skip_api and (args.only is None or args.only in "api/POST /analyze"):
+        extra, close = api_cases(args.repeat)
+        cases += extra
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    results = {}
+    try:
+        for name, func, repeat in cases:
+            results[name] = measure(func, repeat, args.warmup)
+            r = results[name]
+            print(f"{name:45s} p50 {r['p50_ms']:9.3f} ms  p99 {r['p99_ms']:9.3f} ms  "
+                  f"{r['throughput_per_s']:9.1f}/s  peak {r['peak_memory_mib']:7.2f} MiB")
+    finally:
+        if close is not None:
+            close()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cases": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: p50 {before:.3f} ms -> {after:.3f} ms ({change:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
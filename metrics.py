@@ -0,0 +1,115 @@
+import bisect
+import threading
+
+from originalmodel import collect_stage_timings
+
+# Upper bounds (seconds) of the latency histogram buckets; model stages take from ~50µs to tens of milliseconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def timed_call(func, **kwargs):
+    """Worker entry point: func(**kwargs) with its model stages timed; returns (result, StageTimings)"""
+    with collect_stage_timings() as timings:
+        result = func(**kwargs)
+    return result, timings
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    pairs = ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination, in the Prometheus text layout"""
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    labels = _label_text(self.labels + ("le",), label_values + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _label_text(self.labels, label_values)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Metrics:
+    """The API's request, analysis and model stage metrics, rendered for GET /metrics"""
+
+    def __init__(self):
+        self.request_seconds = Histogram("ipem_request_duration_seconds", "Request latency", ("path",))
+        self.requests = Counter("ipem_requests_total", "Requests served", ("path", "status"))
+        self.request_errors = Counter("ipem_request_errors_total", "Requests answered with a 5xx status", ("path",))
+        self.analyses = Counter("ipem_analyses_total", "Validated analysis payloads (batch: per scenario)", ("fund_mode", "plant_mode"))
+        self.stage_seconds = Histogram("ipem_stage_duration_seconds", "Time per request spent in each model stage", ("stage",))
+        self.stage_errors = Counter("ipem_stage_errors_total", "Model stage calls that raised", ("stage",))
+
+    def observe_request(self, path, status, seconds):
+        self.request_seconds.observe(seconds, path)
+        self.requests.inc(path, status)
+        if status >= 500:
+            self.request_errors.inc(path)
+
+    def observe_stages(self, timings):
+        for stage, seconds in timings.seconds.items():
+            self.stage_seconds.observe(seconds, stage)
+        for stage, errors in timings.errors.items():
+            self.stage_errors.inc(stage, amount=errors)
+
+    def render(self):
+        lines = []
+        for metric in (self.request_seconds, self.requests, self.request_errors, self.analyses, self.stage_seconds, self.stage_errors):
+            lines += metric.expose()
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(stage_ms):
+    """Server-Timing header value from {stage: milliseconds}"""
+    return ", ".join(f"{stage};dur={ms:.3f}" for stage, ms in stage_ms.items())
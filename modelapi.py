@@ -1,23 +1,97 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse, Response, PlainTextResponse
+from pydantic import BaseModel, ValidationError
+from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from contextlib import contextmanager
+from contextvars import ContextVar
 import pandas as pd
 import numpy as np
 import uvicorn
 import logging
-from originalmodel import Analytics_Model2
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('api_logs.log'),
-        logging.StreamHandler()
-    ]
+import asyncio
+import itertools
+import os
+import json
+import time
+from originalmodel import Analytics_Model2, ModelAssumptions
+from resultcache import ResultCache, payload_key
+from referencedata import ReferenceDataStore
+from resultformats import negotiate_format, UnsupportedFormat, column_frame, frame_from_columns, encode_frame, encode_columns, JSON_MEDIA_TYPE, COLUMNS_MEDIA_TYPE
+from batchmodel import Sensitivity_Analysis, SENSITIVITY_PARAMETERS, MonteCarlo_Analysis, Breakeven_Solver, validate_sensitivity, validate_montecarlo
+from requestlog import setup_logging, sample
+from metrics import Metrics, timed_call, server_timing
+from profiling import ProfileLimiter, ProfileStore, profiled_call
+
+try:
+    import orjson
+except ImportError:  # optional, only speeds up NDJSON streaming
+    orjson = None
+
+# Set up logging: records are queued and written by a background thread, JSON lines in a rotating file
+LOG_FILE = os.environ.get("IPEM_LOG_FILE", "api_logs.log")
+LOG_PAYLOAD_RATE = float(os.environ.get("IPEM_LOG_PAYLOAD_RATE", 0))  # fraction of requests logged with their full payload
+log_listener = setup_logging(
+    LOG_FILE,
+    max_bytes=int(os.environ.get("IPEM_LOG_MAX_BYTES", 10 * 2**20)),
+    backup_count=int(os.environ.get("IPEM_LOG_BACKUPS", 5)),
+    level=os.environ.get("IPEM_LOG_LEVEL", "INFO").upper(),
+    console=os.environ.get("IPEM_LOG_CONSOLE", "1") != "0"
 )
 logger = logging.getLogger(__name__)
 
+# Structured fields of the request being served, written as one log record when it completes
+request_fields = ContextVar("request_fields", default=None)
+UNLOGGED_PATHS = {"/health", "/metrics"}
+
+# Opt-in per-stage timing: GET /metrics and a Server-Timing header on every response
+METRICS_ENABLED = os.environ.get("IPEM_METRICS", "0") == "1"
+metrics = Metrics()
+# {stage: milliseconds} of the request being served, sent as its Server-Timing header
+request_timings = ContextVar("request_timings", default=None)
+
+# On-demand cProfile of single /analyze requests (X-IPEM-Profile header), off unless IPEM_PROFILING=1
+PROFILING_ENABLED = os.environ.get("IPEM_PROFILING", "0") == "1"
+PROFILE_TOKEN = os.environ.get("IPEM_PROFILE_TOKEN")  # when set, the header value must match it
+profile_limiter = ProfileLimiter(interval=float(os.environ.get("IPEM_PROFILE_INTERVAL", 60)))  # seconds between profiles
+profile_store = ProfileStore(os.environ.get("IPEM_PROFILE_DIR", "./profiles"), keep=int(os.environ.get("IPEM_PROFILE_KEEP", 50)))
+
+# Model worker pool settings
+MODEL_EXECUTOR = os.environ.get("IPEM_MODEL_EXECUTOR", "process")  # "process" or "thread"
+MODEL_WORKERS = int(os.environ.get("IPEM_MODEL_WORKERS", os.cpu_count() or 1))
+MODEL_MAX_QUEUE = int(os.environ.get("IPEM_MODEL_MAX_QUEUE", 4 * MODEL_WORKERS))  # requests allowed to wait for a worker
+MODEL_TIMEOUT = float(os.environ.get("IPEM_MODEL_TIMEOUT", 60))  # seconds, including time spent queued
+MAX_BATCH_SCENARIOS = int(os.environ.get("IPEM_MAX_BATCH_SCENARIOS", 1000))
+BATCH_CHUNK_SIZE = int(os.environ.get("IPEM_BATCH_CHUNK_SIZE", 25))  # scenarios per model job; each job gets its own timeout
+MAX_MONTECARLO_DRAWS = int(os.environ.get("IPEM_MAX_MONTECARLO_DRAWS", 1000000))
+MAX_MONTECARLO_CHUNK = int(os.environ.get("IPEM_MAX_MONTECARLO_CHUNK", 50000))  # draws evaluated at once; bounds peak memory
+
+PROJECT_DATA_FILE = "./project_data.csv"
+MULTIPLIERS_FILE = "./sectorwise_multipliers.csv"
+COUNTRY_INFO_FILE = "./Country_Info (1).csv"
+DATA_CHECK_INTERVAL = float(os.environ.get("IPEM_DATA_CHECK_INTERVAL", 5))  # seconds between data file mtime checks
+
+# Result cache settings; IPEM_CACHE_SIZE=0 disables caching
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("IPEM_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("IPEM_CACHE_TTL", 3600)),  # seconds
+    path=os.environ.get("IPEM_CACHE_PATH")  # optional SQLite file for on-disk backing
+)
+
+def clear_stale_results(old, new):
+    """Cache keys include the data version, so entries for the old files can never be hit again"""
+    logger.info(f"Data files changed ({old.version} -> {new.version}), clearing result cache")
+    result_cache.clear()
+
+# Reference data snapshot; reloaded automatically when one of the files changes on disk
+reference_store = ReferenceDataStore(PROJECT_DATA_FILE, MULTIPLIERS_FILE, COUNTRY_INFO_FILE,
+                                     check_interval=DATA_CHECK_INTERVAL, on_reload=clear_stale_results)
+
+model_executor = None
+model_slots = None
+model_pending = 0
+
 app = FastAPI(
     title="Project Economics Model API",
     description="API for chemical plant economics analysis - Strict Payload Only",
@@ -73,41 +147,274 @@ class AnalysisRequest(BaseModel):
     Elect_req: float
     feedCcontnt: float
 
+class BatchScenario(AnalysisRequest):
+    # Optional id used to key the results; defaults to the scenario's position in the list
+    scenario_id: Optional[str] = None
+
+class BatchAnalysisRequest(BaseModel):
+    # Either an explicit list of payloads...
+    scenarios: Optional[List[BatchScenario]] = None
+    # ...and/or a base payload expanded over the cartesian product of the grid overrides,
+    # e.g. {"fund_mode": ["Debt", "Equity", "Mixed"], "plant_mode": ["Green", "Brown"]}
+    base: Optional[Dict[str, Any]] = None
+    grid: Optional[Dict[str, List[Any]]] = None
+
+class SensitivityRequest(AnalysisRequest):
+    # Inputs to perturb and the relative change applied in each direction
+    parameters: List[str] = list(SENSITIVITY_PARAMETERS)
+    change: float = 0.10
+
+class MonteCarloRequest(AnalysisRequest):
+    # Input name -> distribution spec, e.g. {"Feed_Price": {"dist": "triangular", "low": 600, "mode": 700, "high": 900}}
+    distributions: Dict[str, Dict[str, Any]]
+    n_draws: int = 100000
+    chunk_size: int = 20000
+    seed: Optional[int] = None
+
+class BreakevenSolverRequest(AnalysisRequest):
+    method: str = "fixed_point"  # "fixed_point" or "bracket"
+    tol: float = 1e-10
+    max_iter: int = 100
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    """
+    One structured log record per request with its status, duration and the fields the endpoint noted.
+    With metrics enabled the request is also counted and timed, and its stage timings are sent as Server-Timing.
+    """
+    if request.url.path in UNLOGGED_PATHS:
+        return await call_next(request)
+    fields = {}
+    request_fields.set(fields)
+    timings = {} if METRICS_ENABLED else None
+    request_timings.set(timings)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if timings is not None:
+            timings["total"] = (time.perf_counter() - started) * 1000
+            response.headers["Server-Timing"] = server_timing(timings)
+        if "profile_id" in fields:
+            response.headers["X-IPEM-Profile-Id"] = fields["profile_id"]
+        return response
+    finally:
+        duration = time.perf_counter() - started
+        fields = {"method": request.method, "path": request.url.path, "status": status,
+                  "duration_ms": round(duration * 1000, 3), **fields}
+        if timings:
+            fields["timings_ms"] = {stage: round(ms, 3) for stage, ms in timings.items()}
+        logger.info(f"{request.method} {request.url.path} {status} {duration * 1000:.1f}ms", extra={"fields": fields})
+        if timings is not None:
+            route = request.scope.get("route")
+            metrics.observe_request(route.path if route is not None else "unmatched", status, duration)
+
+def note_request(**fields):
+    """Add fields to the current request's log record"""
+    current = request_fields.get()
+    if current is not None:
+        current.update(fields)
+
+def note_payload(config: dict):
+    """Summary of an analysis payload for the request log; the full payload for a LOG_PAYLOAD_RATE sample"""
+    note_request(location=config["location"], product=config.get("product"), plant_mode=config["plant_mode"],
+                 fund_mode=config["fund_mode"], opex_mode=config["opex_mode"], carbon_value=config["carbon_value"])
+    if sample(LOG_PAYLOAD_RATE):
+        note_request(payload=config)
+
+def count_analyses(*configs: dict):
+    """Count payloads that passed every check in the analyses metric; call only once a request is about to run"""
+    if METRICS_ENABLED:
+        for config in configs:
+            metrics.analyses.inc(config["fund_mode"], config["plant_mode"])
+
+def note_timing(stage: str, seconds: float):
+    """Add time spent in a stage to the current request's Server-Timing header"""
+    timings = request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds * 1000
+
+@contextmanager
+def timed_request_stage(stage: str):
+    """Time the block as `stage` of the current request (e.g. "serialize") when metrics are enabled"""
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        note_timing(stage, seconds)
+        metrics.stage_seconds.observe(seconds, stage)
+
 @app.on_event("startup")
 async def startup_event():
     """Load required data files"""
-    global project_datas, multipliers
+    load_data_files()
+
+    global model_executor, model_slots
+    if MODEL_EXECUTOR == "thread":
+        model_executor = ThreadPoolExecutor(max_workers=MODEL_WORKERS)
+    else:
+        model_executor = ProcessPoolExecutor(max_workers=MODEL_WORKERS)
+    model_slots = asyncio.Semaphore(MODEL_WORKERS)
+    logger.info(f"Model pool started: {MODEL_EXECUTOR} x {MODEL_WORKERS}, queue {MODEL_MAX_QUEUE}, timeout {MODEL_TIMEOUT}s")
+
+def load_data_files():
+    """(Re)load the reference data files; cached results are evicted when their contents changed"""
     try:
-        project_datas = pd.read_csv("./project_data.csv")
-        multipliers = pd.read_csv("./sectorwise_multipliers.csv")
-        logger.info("Data files loaded successfully")
+        reference = reference_store.load()
+        logger.info(f"Data files loaded successfully (version {reference.version})")
     except FileNotFoundError as e:
         logger.error(f"Required data files not found: {str(e)}")
         raise Exception(f"Required data files not found: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the model worker pool"""
+    if model_executor is not None:
+        model_executor.shutdown(wait=False, cancel_futures=True)
+
+async def run_model(func, **kwargs):
+    """
+    Run a CPU-bound model function in the worker pool so the event loop stays free.
+    At most MODEL_WORKERS calls run at once and MODEL_MAX_QUEUE more may wait; beyond that the request
+    is rejected with 503. Calls that do not finish within MODEL_TIMEOUT (queue time included) get a 504.
+    A worker cannot be interrupted, so a call that times out while running keeps its slot and its place in the
+    pending count until the worker finishes; only the client is answered early. Calls still waiting for a slot are dropped.
+    """
+    global model_pending
+    if model_pending >= MODEL_WORKERS + MODEL_MAX_QUEUE:
+        logger.warning(f"Model queue full ({model_pending} pending), rejecting request")
+        raise HTTPException(status_code=503, detail="Model workers busy, please retry later")
+
+    started = False
+    timed_out = False
+
+    async def run_in_slot():
+        nonlocal started
+        async with model_slots:
+            started = True
+            loop = asyncio.get_running_loop()
+            if not METRICS_ENABLED:
+                return await loop.run_in_executor(model_executor, partial(func, **kwargs))
+            # Stage timings are collected inside the worker and sent back with the result
+            result, timings = await loop.run_in_executor(model_executor, partial(timed_call, func, **kwargs))
+            metrics.observe_stages(timings)
+            for stage, seconds in timings.seconds.items():
+                note_timing(stage, seconds)
+            return result
+
+    def finished(job):
+        global model_pending
+        model_pending -= 1
+        if timed_out and not job.cancelled() and job.exception() is not None:
+            logger.error(f"Model run that timed out failed afterwards: {job.exception()}")
+
+    model_pending += 1
+    job = asyncio.ensure_future(run_in_slot())
+    job.add_done_callback(finished)
+    try:
+        # The shield keeps the timeout from cancelling a job that already holds a worker
+        return await asyncio.wait_for(asyncio.shield(job), timeout=MODEL_TIMEOUT)
+    except asyncio.TimeoutError:
+        timed_out = True
+        logger.error(f"Model run exceeded {MODEL_TIMEOUT}s timeout")
+        raise HTTPException(status_code=504, detail=f"Analysis timed out after {MODEL_TIMEOUT} seconds")
+    finally:
+        # Timed out or abandoned by the client before reaching a worker: nothing has run yet, so drop it
+        if not started:
+            job.cancel()
+
+@app.get("/health")
+async def health():
+    """Liveness check; answered on the event loop even while model workers are busy"""
+    return {"status": "ok", "model_workers": MODEL_WORKERS, "model_pending": model_pending}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Request, analysis and model stage metrics in the Prometheus text format; requires IPEM_METRICS=1"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled; set IPEM_METRICS=1 to enable them")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = "text", x_ipem_profile: Optional[str] = Header(None)):
+    """
+    A stored request profile: the text summary (default) or, with ?format=pstats, the pstats dump.
+    When IPEM_PROFILE_TOKEN is set, the X-IPEM-Profile header must carry it.
+    """
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled; set IPEM_PROFILING=1 to enable it")
+    if PROFILE_TOKEN is not None and x_ipem_profile != PROFILE_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    if format not in ("text", "pstats"):
+        raise HTTPException(status_code=400, detail="format must be 'text' or 'pstats'")
+    try:
+        path = profile_store.path(profile_id, "txt" if format == "text" else "prof")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    with open(path, "rb") as f:
+        content = f.read()
+    if format == "text":
+        return PlainTextResponse(content)
+    return Response(content, media_type="application/octet-stream",
+                    headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'})
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters"""
+    return {**result_cache.stats(), "data_version": reference_store.version}
+
 @app.post("/analyze", response_model=List[dict])
-async def run_analysis(request: AnalysisRequest):
+async def run_analysis(request: AnalysisRequest, stream: bool = False, accept: Optional[str] = Header(None),
+                       x_ipem_profile: Optional[str] = Header(None)):
     """
     Run economic analysis using ONLY the provided payload values.
     All parameters are required except product, plant_size, and plant_effy - no defaults will be used.
+    With ?stream=true the rows are sent as NDJSON (one JSON object per line) while they are serialized.
+    The Accept header selects column-oriented JSON, Arrow IPC or Parquet instead of JSON records.
+    An X-IPEM-Profile header runs the model under cProfile; the stored profile's id is returned in X-IPEM-Profile-Id.
     """
-    # Convert request to dict and log everything
     config = request.dict()
-    logger.info("\n=== PAYLOAD VALUES RECEIVED ===")
-    for key, value in config.items():
-        logger.info(f"{key}: {value}")
+    note_payload(config)
+    
+    # Validate parameters against one reference data snapshot used for the whole request
+    reference = reference_store.current()
+    validate_parameters(config, reference)
+    media_type = response_format(accept)
+    profile = profile_requested(x_ipem_profile)
+    count_analyses(config)
     
-    # Validate parameters
-    validate_parameters(config)
+    # Identical payloads against the same data files are answered from the cache; profiled requests always run the model.
+    # Column/Arrow/Parquet results are cached in their column-oriented form under their own key, so they never build row records
+    formatted = media_type != JSON_MEDIA_TYPE and not stream
+    cache_key = payload_key(config, reference.version)
+    if formatted:
+        cache_key += ":columns"
+    cached = result_cache.get(cache_key) if not profile else None
+    note_request(data_version=reference.version, cache="hit" if cached is not None else "miss", stream=stream, format=media_type)
+    if cached is not None:
+        if stream:
+            return StreamingResponse(ndjson_records(cached), media_type=NDJSON_MEDIA_TYPE)
+        if formatted:
+            return formatted_response(cached, media_type)
+        return cached
     
     # Create data row from payload only
     custom_data = create_custom_data_row(config)
     
     # Run analysis
     try:
-        logger.info("Starting analysis with payload values only...")
-        results = Analytics_Model2(
-            multiplier=multipliers,
+        model = {"target": Analytics_Model2} if profile else {}
+        results = await run_model(
+            profiled_call if profile else Analytics_Model2,
+            **model,
+            multiplier=reference.multiplier_index,
             project_data=custom_data,
             location=config["location"],
             product=config.get("product", ""),  # Use empty string if product not provided
@@ -116,25 +423,401 @@ async def run_analysis(request: AnalysisRequest):
             opex_mode=config["opex_mode"],
             plant_size=config.get("plant_size", ""),  # Use empty string if plant_size not provided
             plant_effy=config.get("plant_effy", ""),  # Use empty string if plant_effy not provided
-            carbon_value=config["carbon_value"]
+            carbon_value=config["carbon_value"],
+            assumptions=payload_assumptions(config)
         )
+        if profile:
+            results, profile_data = results
+            # Writing the dump and formatting the pstats summary is blocking file work, kept off the event loop
+            note_request(profile_id=await asyncio.to_thread(profile_store.save, profile_data, config))
         
-        logger.info("Analysis completed successfully")
-        return results.to_dict(orient='records')
+        note_request(rows=len(results))
+        if stream:
+            return StreamingResponse(ndjson_frame(results, cache_key=cache_key), media_type=NDJSON_MEDIA_TYPE)
+        if formatted:
+            if media_type != COLUMNS_MEDIA_TYPE and not result_cache.enabled:
+                return formatted_response(results, media_type)
+            with timed_request_stage("serialize"):
+                columns = column_frame(results)
+            result_cache.set(cache_key, columns)
+            return formatted_response(columns if media_type == COLUMNS_MEDIA_TYPE else results, media_type)
+        with timed_request_stage("serialize"):
+            records = results.to_dict(orient='records')
+        result_cache.set(cache_key, records)
+        return records
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error running analysis: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error running analysis: {str(e)}")
 
-def validate_parameters(config: dict):
-    """Validate all payload parameters"""
-    if config["location"] not in project_datas['Country'].unique():
+@app.post("/analyze/batch", response_model=Dict[str, List[dict]])
+async def run_batch_analysis(request: BatchAnalysisRequest, stream: bool = False, accept: Optional[str] = Header(None)):
+    """
+    Run the economic analysis for many scenarios in one request.
+    Every scenario is validated like an /analyze payload before any model runs; results are keyed by scenario id.
+    With ?stream=true each scenario's rows are sent as NDJSON lines tagged with "scenario_id" as soon as that
+    scenario finishes, so clients can consume early scenarios while later ones are still running.
+    Arrow IPC and Parquet responses hold one table with a leading "scenario_id" column.
+    """
+    scenarios = expand_batch_request(request)
+    note_request(scenarios=len(scenarios), stream=stream)
+
+    reference = reference_store.current()
+    for scenario_id, config in scenarios:
+        try:
+            validate_parameters(config, reference)
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"Scenario {scenario_id}: {e.detail}")
+    media_type = response_format(accept)
+    count_analyses(*(config for _, config in scenarios))
+
+    # Scenarios already in the result cache skip the model run
+    cache_keys = {scenario_id: payload_key(config, reference.version) for scenario_id, config in scenarios}
+    results = {}
+    for scenario_id, _ in scenarios:
+        cached = result_cache.get(cache_keys[scenario_id])
+        if cached is not None:
+            results[scenario_id] = cached
+    pending = [(scenario_id, config) for scenario_id, config in scenarios if scenario_id not in results]
+
+    if stream:
+        note_request(cached_scenarios=len(results))
+        return StreamingResponse(stream_batch(reference.multiplier_index, results, pending, cache_keys), media_type=NDJSON_MEDIA_TYPE)
+
+    try:
+        if pending:
+            computed = await run_batch_chunks(reference.multiplier_index, pending)
+            for scenario_id, records in computed.items():
+                result_cache.set(cache_keys[scenario_id], records)
+            results.update(computed)
+        note_request(cached_scenarios=len(scenarios) - len(pending))
+        ordered = {scenario_id: results[scenario_id] for scenario_id, _ in scenarios}
+        if media_type == COLUMNS_MEDIA_TYPE:
+            return Response(encode_columns({scenario_id: column_frame(records) for scenario_id, records in ordered.items()}),
+                            media_type=media_type)
+        if media_type != JSON_MEDIA_TYPE:
+            frame = pd.concat(
+                [pd.DataFrame.from_records(records).assign(scenario_id=scenario_id) for scenario_id, records in ordered.items()],
+                ignore_index=True
+            )
+            return formatted_response(frame[["scenario_id"] + [name for name in frame.columns if name != "scenario_id"]], media_type)
+        return ordered
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running batch analysis: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error running batch analysis: {str(e)}")
+
+@app.post("/sensitivity", response_model=List[dict])
+async def run_sensitivity(request: SensitivityRequest):
+    """
+    Tornado table of the Constant$ Breakeven Price for +/- `change` moves in each of `parameters`.
+    Only the process and microeconomic models run (as one vectorized batch); the macro stage is skipped.
+    """
+    config = request.dict()
+    note_payload(config)
+    validate_parameters(config, reference_store.current())
+
+    try:
+        validate_sensitivity(config["parameters"], config["change"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    count_analyses(config)
+
+    try:
+        table = await run_model(
+            Sensitivity_Analysis,
+            data=custom_data_record(config),
+            plant_mode=config["plant_mode"],
+            fund_mode=config["fund_mode"],
+            opex_mode=config["opex_mode"],
+            carbon_value=config["carbon_value"],
+            parameters=tuple(config["parameters"]),
+            change=config["change"],
+            assumptions=payload_assumptions(config)
+        )
+        return table.to_dict(orient='records')
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running sensitivity analysis: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error running sensitivity analysis: {str(e)}")
+
+@app.post("/montecarlo")
+async def run_montecarlo(request: MonteCarloRequest):
+    """
+    Monte Carlo P10/P50/P90 of the breakeven prices and cumulative cash flows for one /analyze payload,
+    sampling the inputs named in `distributions`. Pass a seed for reproducible results.
+    """
+    config = request.dict()
+    note_payload(config)
+    validate_parameters(config, reference_store.current())
+
+    try:
+        validate_montecarlo(config["distributions"], config["n_draws"], config["chunk_size"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if config["n_draws"] > MAX_MONTECARLO_DRAWS:
+        raise HTTPException(status_code=400, detail=f"n_draws must be at most {MAX_MONTECARLO_DRAWS}")
+    count_analyses(config)
+
+    try:
+        summary, cashflows = await run_model(
+            MonteCarlo_Analysis,
+            data=custom_data_record(config),
+            plant_mode=config["plant_mode"],
+            fund_mode=config["fund_mode"],
+            opex_mode=config["opex_mode"],
+            carbon_value=config["carbon_value"],
+            distributions=config["distributions"],
+            n_draws=config["n_draws"],
+            chunk_size=min(config["chunk_size"], MAX_MONTECARLO_CHUNK),
+            seed=config["seed"],
+            assumptions=payload_assumptions(config)
+        )
+        return {
+            "n_draws": config["n_draws"],
+            "seed": config["seed"],
+            "summary": summary.reset_index(names="Metric").to_dict(orient='records'),
+            "cashflows": cashflows.to_dict(orient='records')
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running Monte Carlo analysis: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error running Monte Carlo analysis: {str(e)}")
+
+@app.post("/breakeven/solve")
+async def run_breakeven_solver(request: BreakevenSolverRequest):
+    """
+    Converged (self-consistent) breakeven prices for a Green-field Debt or Mixed payload, with the one-pass
+    MicroEconomic_Model value, the solver's iteration count and its residual.
+    """
+    config = request.dict()
+    note_payload(config)
+    validate_parameters(config, reference_store.current())
+
+    if config["plant_mode"] != "Green" or config["fund_mode"] not in ["Debt", "Mixed"]:
+        raise HTTPException(status_code=400, detail="The breakeven solver applies to Green plant_mode with Debt or Mixed fund_mode")
+    if config["method"] not in ["fixed_point", "bracket"]:
+        raise HTTPException(status_code=400, detail="method must be 'fixed_point' or 'bracket'")
+    count_analyses(config)
+
+    try:
+        solution = await run_model(
+            Breakeven_Solver,
+            data=custom_data_record(config),
+            opex_mode=config["opex_mode"],
+            carbon_value=config["carbon_value"],
+            fund_mode=config["fund_mode"],
+            method=config["method"],
+            tol=config["tol"],
+            max_iter=config["max_iter"],
+            assumptions=payload_assumptions(config)
+        )
+        return solution.to_dict(orient='records')[0]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running breakeven solver: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error running breakeven solver: {str(e)}")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def response_format(accept: Optional[str]) -> str:
+    """Negotiated media type for an analysis result; 406 when only unavailable formats were requested"""
+    try:
+        return negotiate_format(accept)
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+def formatted_response(results, media_type: str) -> Response:
+    """Encode a result DataFrame, cached records or a cached column_frame payload as column-oriented JSON, Arrow IPC or Parquet"""
+    with timed_request_stage("serialize"):
+        if media_type == COLUMNS_MEDIA_TYPE:
+            payload = results if isinstance(results, dict) else column_frame(results)
+            return Response(encode_columns(payload), media_type=media_type)
+        if isinstance(results, dict):
+            frame = frame_from_columns(results)
+        elif isinstance(results, pd.DataFrame):
+            frame = results
+        else:
+            frame = pd.DataFrame.from_records(results)
+        return Response(encode_frame(frame, media_type), media_type=media_type)
+
+def ndjson_line(record: dict) -> bytes:
+    """One NDJSON line; orjson when installed, else the standard library"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+    return (json.dumps(record, default=str) + "\n").encode("utf-8")
+
+def ndjson_records(records: list, scenario_id: str = None):
+    """NDJSON lines for already materialized records (e.g. a cache hit)"""
+    for record in records:
+        if scenario_id is not None:
+            record = {"scenario_id": scenario_id, **record}
+        yield ndjson_line(record)
+
+def ndjson_frame(results: pd.DataFrame, scenario_id: str = None, cache_key: str = None):
+    """
+    NDJSON lines built straight from the result columns, one line per row, without first materializing
+    the whole records list. When cache_key is given the records are stored in the result cache once all were sent.
+    """
+    names = list(results.columns)
+    columns = [results[name].tolist() for name in names]
+    records = [] if cache_key is not None and result_cache.enabled else None
+    for values in zip(*columns):
+        record = dict(zip(names, values))
+        if records is not None:
+            records.append(record)
+        if scenario_id is not None:
+            record = {"scenario_id": scenario_id, **record}
+        yield ndjson_line(record)
+    if records is not None:
+        result_cache.set(cache_key, records)
+
+async def stream_batch(multiplier, cached: dict, pending: list, cache_keys: dict):
+    """
+    NDJSON body of a streamed batch: cached scenarios first, then the pending ones in completion order,
+    keeping at most MODEL_WORKERS scenarios in flight. A failing scenario yields an {"scenario_id", "error"} line
+    instead of aborting the rest of the stream.
+    """
+    for scenario_id, records in cached.items():
+        for line in ndjson_records(records, scenario_id):
+            yield line
+
+    async def run_one(scenario_id, config):
+        try:
+            return scenario_id, await run_model(
+                analyze_scenario,
+                multiplier=multiplier,
+                custom_data=pd.DataFrame([custom_data_record(config)]),
+                config=config
+            ), None
+        except HTTPException as e:
+            return scenario_id, None, e.detail
+        except Exception as e:
+            logger.error(f"Error running batch scenario {scenario_id}: {str(e)}", exc_info=True)
+            return scenario_id, None, f"Error running analysis: {str(e)}"
+
+    for start in range(0, len(pending), MODEL_WORKERS):
+        window = [run_one(scenario_id, config) for scenario_id, config in pending[start:start + MODEL_WORKERS]]
+        for finished in asyncio.as_completed(window):
+            scenario_id, results, error = await finished
+            if error is not None:
+                yield ndjson_line({"scenario_id": scenario_id, "error": error})
+                continue
+            for line in ndjson_frame(results, scenario_id, cache_keys[scenario_id]):
+                yield line
+
+async def run_batch_chunks(multiplier, pending: list) -> dict:
+    """
+    Run batch scenarios as separate model jobs of at most BATCH_CHUNK_SIZE scenarios, spread evenly over the worker pool.
+    At most MODEL_WORKERS jobs are submitted at a time, so every job's MODEL_TIMEOUT covers its own run rather than the whole batch.
+    """
+    n_chunks = max(MODEL_WORKERS, -(-len(pending) // BATCH_CHUNK_SIZE))
+    size = -(-len(pending) // n_chunks)
+    chunks = [pending[start:start + size] for start in range(0, len(pending), size)]
+
+    computed = {}
+    for start in range(0, len(chunks), MODEL_WORKERS):
+        window = chunks[start:start + MODEL_WORKERS]
+        parts = await asyncio.gather(*[
+            run_model(
+                analyze_scenarios,
+                multiplier=multiplier,
+                custom_data=pd.DataFrame([custom_data_record(config) for _, config in chunk]),
+                scenarios=chunk
+            )
+            for chunk in window
+        ])
+        for part in parts:
+            computed.update(part)
+    return computed
+
+def expand_batch_request(request: BatchAnalysisRequest) -> list:
+    """Turn a batch request into a list of (scenario_id, config) pairs"""
+    scenarios = []
+    for position, scenario in enumerate(request.scenarios or []):
+        scenario_id = scenario.scenario_id if scenario.scenario_id is not None else str(position)
+        scenarios.append((scenario_id, scenario.dict(exclude={"scenario_id"})))
+
+    if request.base is not None or request.grid:
+        base = request.base or {}
+        grid = request.grid or {}
+        keys = list(grid)
+        for values in itertools.product(*(grid[key] for key in keys)):
+            overrides = dict(zip(keys, values))
+            scenario_id = "|".join(f"{key}={value}" for key, value in overrides.items()) or "base"
+            try:
+                config = AnalysisRequest(**{**base, **overrides}).dict()
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=f"Scenario {scenario_id}: {e}")
+            scenarios.append((scenario_id, config))
+            if len(scenarios) > MAX_BATCH_SCENARIOS:
+                break
+
+    if not scenarios:
+        raise HTTPException(status_code=400, detail="Batch request must contain scenarios or a base payload")
+    if len(scenarios) > MAX_BATCH_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Batch request exceeds {MAX_BATCH_SCENARIOS} scenarios")
+    scenario_ids = [scenario_id for scenario_id, _ in scenarios]
+    if len(set(scenario_ids)) != len(scenario_ids):
+        raise HTTPException(status_code=400, detail="scenario_id values must be unique")
+    return scenarios
+
+def analyze_scenario(multiplier, custom_data: pd.DataFrame, config: dict) -> pd.DataFrame:
+    """Run Analytics_Model2 for a single-row custom_data with the scenario's modes"""
+    return Analytics_Model2(
+        multiplier=multiplier,
+        project_data=custom_data,
+        location=config["location"],
+        product=config.get("product", ""),
+        plant_mode=config["plant_mode"],
+        fund_mode=config["fund_mode"],
+        opex_mode=config["opex_mode"],
+        plant_size=config.get("plant_size", ""),
+        plant_effy=config.get("plant_effy", ""),
+        carbon_value=config["carbon_value"],
+        assumptions=payload_assumptions(config)
+    )
+
+def analyze_scenarios(multiplier, custom_data: pd.DataFrame, scenarios: list) -> dict:
+    """Run Analytics_Model2 for each row of custom_data with its scenario's modes; runs inside a model worker"""
+    results = {}
+    for position, (scenario_id, config) in enumerate(scenarios):
+        result = analyze_scenario(multiplier, custom_data.iloc[[position]], config)
+        results[scenario_id] = result.to_dict(orient='records')
+    return results
+
+def profile_requested(header: Optional[str]) -> bool:
+    """Whether to profile this request: 403 when profiling is disabled or the token is wrong, 429 when rate limited"""
+    if not header:
+        return False
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=403, detail="Profiling is disabled")
+    if PROFILE_TOKEN is not None and header != PROFILE_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    if not profile_limiter.acquire():
+        raise HTTPException(status_code=429, detail="A request was profiled recently, please retry later",
+                            headers={"Retry-After": str(profile_limiter.retry_after())})
+    return True
+
+def validate_parameters(config: dict, reference):
+    """Validate all payload parameters against a reference data snapshot"""
+    if config["location"] not in reference.countries:
         logger.error(f"Invalid location: {config['location']}")
         raise HTTPException(status_code=400, detail="Invalid location")
     
     # Only validate product if it's provided
     if "product" in config and config["product"] is not None:
-        if config["product"] not in project_datas['Main_Prod'].unique():
+        if config["product"] not in reference.products:
             logger.error(f"Invalid product: {config['product']}")
             raise HTTPException(status_code=400, detail="Invalid product")
     
@@ -168,10 +851,42 @@ def validate_parameters(config: dict):
     
     if config["hEFF"] <= 0 or config["hEFF"] > 1:
         raise HTTPException(status_code=400, detail="Heat efficiency must be between 0 and 1")
+    
+    payload_assumptions(config)
+
+def payload_assumptions(config: dict) -> ModelAssumptions:
+    """Technical and financial assumptions from the payload, shared by all model stages"""
+    try:
+        return ModelAssumptions(
+            construction_prd=config["construction_prd"],
+            operating_prd=config["operating_prd"],
+            util_operating_first=config["util_operating_first"],
+            util_operating_second=config["util_operating_second"],
+            util_operating_third=config["util_operating_third"],
+            infl=config["infl"],
+            RR=config["RR"],
+            IRR=config["IRR"],
+            shrDebt=config["shrDebt_value"],
+            capex_spread=config["capex_spread"],
+            ownerCost=config["ownerCost"],
+            credit=config["credit_value"],
+            PRIcoef=config["PRIcoef"],
+            CONcoef=config["CONcoef"],
+            EcNatGas=config["EcNatGas"],
+            ngCcontnt=config["ngCcontnt"],
+            eEFF=config["eEFF"],
+            hEFF=config["hEFF"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 def create_custom_data_row(config: dict) -> pd.DataFrame:
     """Create data row from payload values only"""
-    data = {
+    return pd.DataFrame([custom_data_record(config)])
+
+def custom_data_record(config: dict) -> dict:
+    """Map payload values onto the project_data.csv column names"""
+    return {
         "Country": config["location"],
         "Main_Prod": config.get("product", ""),  # Use empty string if product not provided
         "Plant_Size": config.get("plant_size", ""),  # Use empty string if plant_size not provided
@@ -196,12 +911,6 @@ def create_custom_data_row(config: dict) -> pd.DataFrame:
         "eEFF": config["eEFF"],
         "hEFF": config["hEFF"]
     }
-    
-    logger.info("\nCustom Data Row Created From Payload:")
-    for key, value in data.items():
-        logger.info(f"{key}: {value}")
-    
-    return pd.DataFrame([data])
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
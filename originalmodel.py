@@ -1,43 +1,203 @@
 import pandas as pd
 import numpy as np
+from itertools import accumulate, product as cartesian_product
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+from dataclasses import dataclass
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+
+@lru_cache(maxsize=1024)
+def compound_factors(rate, horizon):
+  """
+  (1 + rate) ** i for i in range(horizon) as a read-only float64 vector. Memoized per (rate, horizon), so the
+  inflation and discount factors are computed once and shared by every model stage and request.
+  """
+  factors = np.array([(1 + rate) ** i for i in range(horizon)], dtype=np.float64)
+  factors.setflags(write=False)
+  return factors
+
+class StageTimings:
+  """Wall time, call count and failures per model stage ("process", "micro", "macro", "frame") of one model run"""
+
+  def __init__(self):
+    self.seconds = {}
+    self.calls = {}
+    self.errors = {}
+
+  def add(self, stage, seconds, failed=False):
+    self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+    self.calls[stage] = self.calls.get(stage, 0) + 1
+    if failed:
+      self.errors[stage] = self.errors.get(stage, 0) + 1
+
+
+# Collector of the model run in progress; None (the default) leaves the stages untimed
+_stage_timings = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def collect_stage_timings():
+  """Time every model stage called inside the block into the StageTimings it yields"""
+  timings = StageTimings()
+  token = _stage_timings.set(timings)
+  try:
+    yield timings
+  finally:
+    _stage_timings.reset(token)
+
+
+def timed_stage(stage, func, *args, **kwargs):
+  """func(*args, **kwargs), timed under `stage` when a collect_stage_timings() block is active"""
+  timings = _stage_timings.get()
+  if timings is None:
+    return func(*args, **kwargs)
+  started = perf_counter()
+  try:
+    result = func(*args, **kwargs)
+  except Exception:
+    timings.add(stage, perf_counter() - started, failed=True)
+    raise
+  timings.add(stage, perf_counter() - started)
+  return result
+
+
+class ModelInputs(NamedTuple):
+  """
+  The project_data.csv values read by the process, micro and macro models, as a compact typed record.
+  Field access is a tuple slot lookup instead of a pandas label lookup; build one with model_inputs().
+  """
+  Cap: float
+  Yld: float
+  Base_Yr: int
+  CAPEX: float
+  OPEX: float
+  Feed_Price: float
+  Heat_req: float
+  Elect_req: float
+  Fuel_Price: float
+  Elect_Price: float
+  feedEcontnt: float
+  feedCcontnt: float
+  corpTAX: float
+  CO2price: float
+
+
+def model_inputs(data):
+  """Adapter from a pandas Series, dict or any other column mapping to ModelInputs; records pass through unchanged"""
+  if isinstance(data, ModelInputs):
+    return data
+  return ModelInputs(*[int(data[name]) if name == 'Base_Yr' else float(data[name]) for name in ModelInputs._fields])
+
+
+@dataclass(frozen=True)
+class ModelAssumptions:
+  """
+  Technical and financial assumptions shared by the process, micro and macro models. The defaults are the constants
+  the models were calibrated with. Instances are immutable and hashable, so per-horizon tables and results can be
+  cached per assumption set.
+  """
+  construction_prd: int = 3
+  operating_prd: int = 27
+  util_operating_first: float = 0.70
+  util_operating_second: float = 0.80
+  util_operating_third: float = 0.95
+  infl: float = 0.02
+  RR: float = 0.035
+  IRR: float = 0.10
+  shrDebt: float = 0.60
+  capex_spread: Tuple[float, ...] = (0.20, 0.50, 0.30)
+  ownerCost: float = 0.10
+  credit: float = 0.10
+  PRIcoef: float = 0.3
+  CONcoef: float = 0.7
+  EcNatGas: float = 53.6
+  ngCcontnt: float = 50.3
+  eEFF: float = 0.50
+  hEFF: float = 0.80
+  elEFF: float = 0.90
+
+  def __post_init__(self):
+    object.__setattr__(self, 'capex_spread', tuple(float(share) for share in self.capex_spread))
+    if self.construction_prd < 1:
+      raise ValueError("construction_prd must be at least 1")
+    if self.operating_prd < 3:
+      raise ValueError("operating_prd must be at least 3")
+    if len(self.capex_spread) != self.construction_prd:
+      raise ValueError("capex_spread must have one share per construction year")
+    if any(not share >= 0 for share in self.capex_spread):
+      raise ValueError("capex_spread shares must not be negative")
+    # Rates of -1 or below zero the compounding factors; the negated comparisons also reject NaN
+    for name in ('infl', 'RR', 'IRR'):
+      if not getattr(self, name) > -1:
+        raise ValueError(f"{name} must be greater than -1")
+    for name in ('shrDebt', 'ownerCost', 'credit'):
+      if not 0 <= getattr(self, name) <= 1:
+        raise ValueError(f"{name} must be between 0 and 1")
+    for name in ('util_operating_first', 'util_operating_second', 'util_operating_third'):
+      if not 0 < getattr(self, name) <= 1:
+        raise ValueError(f"{name} must be greater than 0 and at most 1")
+
+  @property
+  def project_life(self):
+    return self.construction_prd + self.operating_prd
+
+  @property
+  def wacc(self):
+    return (self.shrDebt * self.RR) + ((1 - self.shrDebt) * self.IRR)
+
+
+DEFAULT_ASSUMPTIONS = ModelAssumptions()
+
+
+@lru_cache(maxsize=256)
+def utilization_factors(assumptions):
+  """Read-only capacity utilization profile over the project life: zero while building, then the three ramp-up factors"""
+  construction_prd = assumptions.construction_prd
+  util_fac = np.zeros(assumptions.project_life)
+  util_fac[construction_prd] = assumptions.util_operating_first
+  util_fac[(construction_prd+1)] = assumptions.util_operating_second
+  util_fac[(construction_prd+2):] = assumptions.util_operating_third
+  util_fac.flags.writeable = False
+  return util_fac
+
 
 ##################################################################PROCESS MODEL BEGINS##############################################################################
 
-def ChemProcess_Model(data):
+def ChemProcess_Model(data, assumptions=None):
 
-  EcNatGas = 53.6
+  data = model_inputs(data)
+  if assumptions is None:
+    assumptions = DEFAULT_ASSUMPTIONS
 
-  ngCcontnt = 50.3
+  EcNatGas = assumptions.EcNatGas
 
+  ngCcontnt = assumptions.ngCcontnt
 
-  hEFF = 0.80
-  eEFF = 0.50
 
+  hEFF = assumptions.hEFF
+  eEFF = assumptions.eEFF
 
-  construction_prd = 3
-  operating_prd = 27
-  project_life = construction_prd + operating_prd
 
-  util_fac = np.zeros(project_life)
-  util_fac[construction_prd] = 0.70
-  util_fac[(construction_prd+1)] = 0.80
-  util_fac[(construction_prd+2):] = 0.95
+  util_fac = utilization_factors(assumptions)
 
-  prodQ = util_fac * data['Cap']
+  prodQ = util_fac * data.Cap
 
-  feedQ = prodQ / data['Yld']
+  feedQ = prodQ / data.Yld
 
-  fuelgas = data['feedEcontnt'] * (1 - data['Yld']) * feedQ   
+  fuelgas = data.feedEcontnt * (1 - data.Yld) * feedQ   
 
-  Rheat = data['Heat_req'] * (prodQ / hEFF)
+  Rheat = data.Heat_req * (prodQ / hEFF)
 
   dHF = Rheat - fuelgas
   netHeat = np.maximum(0, dHF)          
 
-  Relec = data['Elect_req'] * (prodQ / eEFF)
+  Relec = data.Elect_req * (prodQ / eEFF)
 
-  #ghg_dir = Rheat * data['feedCcontnt']       
-  ghg_dir = (fuelgas * data['feedCcontnt']) + (dHF * ngCcontnt / 1000)
+  #ghg_dir = Rheat * data.feedCcontnt       
+  ghg_dir = (fuelgas * data.feedCcontnt) + (dHF * ngCcontnt / 1000)
 
   ghg_ind = Relec * ngCcontnt / 1000  
 
@@ -49,46 +209,71 @@ def ChemProcess_Model(data):
 
 #####################################################MICROECONOMIC MODEL BEGINS##################################################################################
 
-def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
+def bank_charge_recurrence(NetRevn, bank_chrg, RR, construction_prd, project_life):
+  """
+  Operating-period bank charges: interest at RR on the shortfall between cumulative net revenue up to year i
+  and the bank charges paid up to year i - 2. Updates bank_chrg in place using running sums, so it is linear in project_life.
+  """
+  NetRevn_to_date = list(accumulate(NetRevn))
+  chrg_to_date = sum(bank_chrg[:construction_prd])
+  for i in range(construction_prd + 1, project_life):
+      balance = NetRevn_to_date[i - 1] - chrg_to_date
+      chrg_to_date += bank_chrg[i - 1]
+      if balance < 0:
+          bank_chrg[i] = RR * abs(balance)
+      else:
+          bank_chrg[i] = 0
+  return bank_chrg
+
+
+def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value, process=None, assumptions=None):
+
+  data = model_inputs(data)
+  if assumptions is None:
+    assumptions = DEFAULT_ASSUMPTIONS
 
-  prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind = ChemProcess_Model(data)
-  elEFF = 0.90
+  # `process` takes the ChemProcess_Model outputs when the caller has already evaluated them
+  if process is None:
+    process = ChemProcess_Model(data, assumptions)
+  prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind = process
+  elEFF = assumptions.elEFF
 
 
-  Infl = 0.02  
-  RR = 0.035  
-  IRR = 0.10  
+  Infl = assumptions.infl
+  RR = assumptions.RR
+  IRR = assumptions.IRR
 
 
-  shrDebt = 0.60
-  shrEquity = 1 - shrDebt
-  wacc = (shrDebt * RR) + (shrEquity * IRR)
+  shrDebt = assumptions.shrDebt
+  wacc = assumptions.wacc
 
 
-  construction_prd = 3
-  operating_prd = 27
-  project_life = construction_prd + operating_prd
+  construction_prd = assumptions.construction_prd
+  operating_prd = assumptions.operating_prd
+  project_life = assumptions.project_life
 
-  baseYear = data['Base_Yr']
+  baseYear = data.Base_Yr
   Year = list(range(baseYear, baseYear + project_life))
 
+  inflF = compound_factors(Infl, project_life)
+  irrF = compound_factors(IRR, project_life)
+  waccF = compound_factors(wacc, project_life)
 
-  yr1_capex = 0.20
-  yr2_capex = 0.50
-  yr3_capex = 0.30
 
-  OwnerCost = 0.10
+  capex_spread = assumptions.capex_spread
+
+  OwnerCost = assumptions.ownerCost
 
 
 
   corpTAX = np.zeros(project_life)
-  corpTAX[:] = data['corpTAX']
+  corpTAX[:] = data.corpTAX
 
 
   corpTAX[:construction_prd] = 0
 
 
-  credit = 0.10
+  credit = assumptions.credit
 
 
   feedprice = [0] * project_life
@@ -110,16 +295,15 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   if opex_mode == "Inflated":
 
-    for i in range(project_life):
-        feedprice[i] = data["Feed_Price"] * ((1 + Infl) ** i)
-        fuelprice[i] = data["Fuel_Price"] * ((1 + Infl) ** i)
-        elecprice[i] = data["Elect_Price"] * ((1 + Infl) ** i)
+    feedprice = data.Feed_Price * inflF
+    fuelprice = data.Fuel_Price * inflF
+    elecprice = data.Elect_Price * inflF
   else:
 
     for i in range(project_life):
-        feedprice[i] = data["Feed_Price"]
-        fuelprice[i] = data["Fuel_Price"]
-        elecprice[i] = data["Elect_Price"]
+        feedprice[i] = data.Feed_Price
+        fuelprice[i] = data.Fuel_Price
+        elecprice[i] = data.Elect_Price
 
 
 
@@ -129,7 +313,7 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
   eleccst = elEFF * Relec * elecprice
 
 
-  CarbonTAX = [data["CO2price"]] * project_life
+  CarbonTAX = [data.CO2price] * project_life
 
 
   if carbon_value == "Yes":
@@ -143,26 +327,23 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   
   ######NEW START####################
-  capex[0] = yr1_capex * data["CAPEX"]
-  capex[1] = yr2_capex * data["CAPEX"]
-  capex[2] = yr3_capex * data["CAPEX"]
-  opex[construction_prd:] = data["OPEX"] + feedcst[construction_prd:] + fuelcst[construction_prd:] + eleccst[construction_prd:] + CO2cst[construction_prd:]
+  capex[:construction_prd] = [share * data.CAPEX for share in capex_spread]
+  opex[construction_prd:] = data.OPEX + feedcst[construction_prd:] + fuelcst[construction_prd:] + eleccst[construction_prd:] + CO2cst[construction_prd:]
   ########NEW END####################
 
-  Yrly_invsmt[0] = yr1_capex * data["CAPEX"]
-  Yrly_invsmt[1] = yr2_capex * data["CAPEX"]
-  Yrly_invsmt[2] = yr3_capex * data["CAPEX"]
-  Yrly_invsmt[construction_prd:] = data["OPEX"] + feedcst[construction_prd:] + fuelcst[construction_prd:] + eleccst[construction_prd:] + CO2cst[construction_prd:]
+  Yrly_invsmt[:construction_prd] = [share * data.CAPEX for share in capex_spread]
+  Yrly_invsmt[construction_prd:] = data.OPEX + feedcst[construction_prd:] + fuelcst[construction_prd:] + eleccst[construction_prd:] + CO2cst[construction_prd:]
 
   
   bank_chrg = [0] * project_life
 
   if fund_mode == "Debt":    #----------------------------------------------------DEBT----------------------------------
+    invsmt_to_date = list(accumulate(Yrly_invsmt))
     for i in range(project_life):
         if i <= (construction_prd + 1):
-            bank_chrg[i] = RR * sum(Yrly_invsmt[:i+1])
+            bank_chrg[i] = RR * invsmt_to_date[i]
         else:
-            bank_chrg[i] = RR * sum(Yrly_invsmt[:construction_prd+1])
+            bank_chrg[i] = RR * invsmt_to_date[construction_prd]
 
     
     deprCAPEX = (1-OwnerCost)*sum(Yrly_invsmt[:construction_prd])
@@ -174,18 +355,16 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / irrF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / irrF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       
@@ -193,14 +372,10 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
       
-      for i in range(construction_prd + 1, project_life):
-          if sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]) < 0:
-              bank_chrg[i] = RR * abs(sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]))
-          else:
-              bank_chrg[i] = 0
+      bank_charge_recurrence(NetRevn, bank_chrg, RR, construction_prd, project_life)
 
       
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       
       tax_pybl = [0] * project_life  
@@ -211,47 +386,47 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
           else:
               if depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) < deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) > deprCAPEX:
                   tax_pybl[i] = (NetRevn[i] + depr_asst - deprCAPEX) * (corpTAX[i])
                   depr_asst += (deprCAPEX - depr_asst)
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) == deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
               else:
                   tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -260,13 +435,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   ######NEW START###################
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -284,18 +459,16 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / irrF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / irrF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       
@@ -303,14 +476,10 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
       
-      for i in range(construction_prd + 1, project_life):
-          if sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]) < 0:
-              bank_chrg[i] = RR * abs(sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]))
-          else:
-              bank_chrg[i] = 0
+      bank_charge_recurrence(NetRevn, bank_chrg, RR, construction_prd, project_life)
 
       
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       
       tax_pybl = [0] * project_life  
@@ -321,19 +490,19 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
           else:
               tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -342,13 +511,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   ######NEW START###################
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -372,18 +541,16 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / irrF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / irrF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       
@@ -391,7 +558,7 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
       
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       
       tax_pybl = [0] * project_life  
@@ -402,47 +569,47 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
           else:
               if depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) < deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) > deprCAPEX:
                   tax_pybl[i] = (NetRevn[i] + depr_asst - deprCAPEX) * (corpTAX[i])
                   depr_asst += (deprCAPEX - depr_asst)
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) == deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
               else:
                   tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+                  dctftr[i] = prodQ[i] / irrF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -451,13 +618,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   ######NEW START###################
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -476,18 +643,16 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / irrF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + IRR) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + IRR) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / irrF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / irrF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       
@@ -495,7 +660,7 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
       
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       
       tax_pybl = [0] * project_life  
@@ -506,19 +671,19 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / irrF[i]
           else:
               tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + IRR) ** i)
-              dctftr[i] = prodQ[i] / ((1 + IRR) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / irrF[i]
+              dctftr[i] = prodQ[i] / irrF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + IRR) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + IRR) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / irrF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / irrF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -527,13 +692,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
   ######NEW START###################
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -544,11 +709,12 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
   ######NEW END###################
 
   else:     #fund_mode is Mixed     ----------------------------------------------MIXED---------------------------------
+    invsmt_to_date = list(accumulate(Yrly_invsmt))
     for i in range(project_life):
         if i <= (construction_prd + 1):
-            bank_chrg[i] = RR * shrDebt * sum(Yrly_invsmt[:i+1])  # Changed this line
+            bank_chrg[i] = RR * shrDebt * invsmt_to_date[i]  # Changed this line
         else:
-            bank_chrg[i] = RR * shrDebt * sum(Yrly_invsmt[:construction_prd+1])  # Changed this line
+            bank_chrg[i] = RR * shrDebt * invsmt_to_date[construction_prd]  # Changed this line
 
     deprCAPEX = (1-OwnerCost)*sum(Yrly_invsmt[:construction_prd])
     
@@ -559,29 +725,23 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + wacc) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + wacc) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / waccF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / waccF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + wacc) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + wacc) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / waccF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / waccF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
-      for i in range(construction_prd + 1, project_life):
-          if sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]) < 0:
-              bank_chrg[i] = RR * abs(sum(NetRevn[:i]) - sum(bank_chrg[:i - 1]))
-          else:
-              bank_chrg[i] = 0
+      bank_charge_recurrence(NetRevn, bank_chrg, RR, construction_prd, project_life)
 
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       tax_pybl = [0] * project_life  
       depr_asst = 0  
@@ -591,47 +751,47 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
-              dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
+              dctftr[i] = prodQ[i] / waccF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
           else:
               if depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) < deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
+                  dctftr[i] = prodQ[i] / waccF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) > deprCAPEX:
                   tax_pybl[i] = (NetRevn[i] + depr_asst - deprCAPEX) * (corpTAX[i])
                   depr_asst += (deprCAPEX - depr_asst)
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + wacc) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / waccF[i]
+                  dctftr[i] = prodQ[i] / waccF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + wacc) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / waccF[i]
               elif depr_asst < deprCAPEX and (NetRevn[i] + depr_asst) == deprCAPEX:
                   tax_pybl[i] = 0
                   depr_asst += NetRevn[i]
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
+                  dctftr[i] = prodQ[i] / waccF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
               else:
                   tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + wacc) ** i)
-                  dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+                  cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / waccF[i]
+                  dctftr[i] = prodQ[i] / waccF[i]
 
-                  dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + wacc) ** i)
+                  dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+                  cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / waccF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -639,13 +799,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Pco = sum(cshflw2) / sum(dctftr2)
 
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -661,23 +821,21 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Yrly_cost = [sum(x) for x in zip(Yrly_invsmt, bank_chrg)]
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + wacc) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / ((1 + wacc) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / waccF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i]))) / waccF[i]
       Pstar = sum(cshflw) / sum(dctftr)
       Rstar = Pstar * prodQ
 
       for i in range(len(Year)):
-        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / ((1 + wacc) ** i)
-        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * ((1 + Infl) ** i)) / ((1 + wacc) ** i)
+        cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) * (1 - (corpTAX[i])) / waccF[i]
+        dctftr[i] = (prodQ[i] * (1 - (corpTAX[i])) * inflF[i]) / waccF[i]
       Pstaro = sum(cshflw) / sum(dctftr)
-      Pstark = [0] * project_life
-      for i in range(project_life):
-        Pstark[i] = Pstaro * ((1 + Infl) ** i)
+      Pstark = Pstaro * inflF
       Rstark = [Pstark[i] * prodQ[i] for i in range(project_life)]
 
       NetRevn = [r - y for r, y in zip(Rstark, Yrly_cost)]
 
-      TIC = data['CAPEX'] + sum(bank_chrg)
+      TIC = data.CAPEX + sum(bank_chrg)
 
       tax_pybl = [0] * project_life  
       depr_asst = 0  
@@ -687,19 +845,19 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       for i in range(len(Year)):
           if NetRevn[i] <= 0:
               tax_pybl[i] = 0
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
-              dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
+              dctftr[i] = prodQ[i] / waccF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / ((1 + wacc) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i]) / waccF[i]
           else:
               tax_pybl[i] = NetRevn[i] * (corpTAX[i])
 
-              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / ((1 + wacc) ** i)
-              dctftr[i] = prodQ[i] / ((1 + wacc) ** i)
+              cshflw[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i]) / waccF[i]
+              dctftr[i] = prodQ[i] / waccF[i]
 
-              dctftr2[i] = prodQ[i] * ((1 + Infl) ** i) / ((1 + wacc) ** i)
-              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / ((1 + wacc) ** i)
+              dctftr2[i] = prodQ[i] * inflF[i] / waccF[i]
+              cshflw2[i] = (Yrly_invsmt[i] + bank_chrg[i] + tax_pybl[i] * (1 - credit)) / waccF[i]
 
       Ps = sum(cshflw) / sum(dctftr)
       Pso = sum(cshflw) / sum(dctftr2)
@@ -707,13 +865,13 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
       Pco = sum(cshflw2) / sum(dctftr2)
 
       for i in range(len(Year)):
-        ContrDenom[i] = prodQ[i] / ((1 + IRR) ** i)
-        capexContrN[i] = (capex[i]) / ((1 + IRR) ** i)
-        opexContrN[i] = (opex[i]) / ((1 + IRR) ** i)
-        feedContrN[i] = (feedcst[i]) / ((1 + IRR) ** i)
-        utilContrN[i] = (eleccst[i] + fuelcst[i]) / ((1 + IRR) ** i)
-        bankContrN[i] = (bank_chrg[i]) / ((1 + IRR) ** i)
-        taxContrN[i] = (tax_pybl[i]) / ((1 + IRR) ** i)
+        ContrDenom[i] = prodQ[i] / irrF[i]
+        capexContrN[i] = (capex[i]) / irrF[i]
+        opexContrN[i] = (opex[i]) / irrF[i]
+        feedContrN[i] = (feedcst[i]) / irrF[i]
+        utilContrN[i] = (eleccst[i] + fuelcst[i]) / irrF[i]
+        bankContrN[i] = (bank_chrg[i]) / irrF[i]
+        taxContrN[i] = (tax_pybl[i]) / irrF[i]
       capexContr = sum(capexContrN) / sum(ContrDenom)
       opexContr = sum(opexContrN) / sum(ContrDenom)
       feedContr = sum(feedContrN) / sum(ContrDenom)
@@ -733,111 +891,91 @@ def MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value):
 
 ############################################################MACROECONOMIC MODEL BEGINS############################################################################
 
-def MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_mode, carbon_value):
+OUTPUT_MULTIPLIER = "Output Multiplier"
+PAY_MULTIPLIER = "Compensation (USD per million USD output)"
+JOB_MULTIPLIER = "Employment Elasticity (Jobs per million USD output)"
+TAX_MULTIPLIER = "Tax Revenue Share (USD per million USD output)"
+GDP_MULTIPLIER = "Value-Added Share (USD per million USD output)"
 
 
-  PRIcoef = 0.3
-  CONcoef = 0.7
+def build_multiplier_index(multiplier):
+  """
+  Indexes the sectorwise multipliers table once so the macro stage does dict lookups instead of boolean-mask scans.
+  Keys are (country, sector, multiplier type) with the sector code stripped of its country prefix (e.g. ("SAU", "C20", TAX_MULTIPLIER));
+  values are (direct, indirect, total) impact triples. The first row wins on duplicate keys, as with the former mask lookups.
+  """
+  index = {}
+  for country, sector, mtype, direct, indirect, total in zip(multiplier['Country'], multiplier['Sector'], multiplier['Multiplier Type'],
+                                                              multiplier['Direct Impact'], multiplier['Indirect Impact'], multiplier['Total Impact']):
+    if sector.startswith(country + "_"):
+      sector = sector[len(country) + 1:]
+    index.setdefault((country, sector, mtype), (float(direct), float(indirect), float(total)))
+  return index
 
-  prodQ, _, _, _, _, _, _ = ChemProcess_Model(data)
-  Ps, _, _, _, _, _, _, _, _, _, _, _, _, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, _, _ = MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value)
 
-  pri_invsmt = [0] * project_life
-  con_invsmt = [0] * project_life
-  bank_invsmt = [0] * project_life
+def MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_mode, carbon_value, assumptions=None, dtype=np.float64):
 
-  pri_invsmt[:construction_prd] = [PRIcoef * Yrly_invsmt[i] for i in range(construction_prd)]
-  # pri_invsmt[construction_prd:] = Yrly_invsmt[construction_prd:]        
-  pri_invsmt[construction_prd:] = [data["OPEX"]] * len(pri_invsmt[construction_prd:])         
-  con_invsmt[:construction_prd] = [CONcoef * Yrly_invsmt[i] for i in range(construction_prd)]
-  bank_invsmt = bank_chrg
+  process = ChemProcess_Model(data, assumptions)
+  Ps, _, _, _, _, _, _, _, _, _, _, _, _, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, _, _ = MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value, process=process, assumptions=assumptions)
 
+  return MacroEconomic_Impacts(multiplier, data, location, process[0], Ps, project_life, construction_prd, Yrly_invsmt, bank_chrg, assumptions, dtype)
 
- 
-  # Chemicals and Chemical Products [C20] Multipliers
-  output_PRI = multiplier[(multiplier['Country'] == location) &
-                          (multiplier['Multiplier Type'] == "Output Multiplier") &
-                          (multiplier['Sector'] == (location + "_" + "C20"))]
 
-  pay_PRI = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Compensation (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "C20"))]
+def MacroEconomic_Impacts(multiplier, data, location, prodQ, Ps, project_life, construction_prd, Yrly_invsmt, bank_chrg, assumptions=None, dtype=np.float64):
 
-  job_PRI = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Employment Elasticity (Jobs per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "C20"))]
+  # Macro stage on precomputed ChemProcess_Model / MicroEconomic_Model results.
+  # Every impact series is returned as a contiguous array of length project_life: float64 (computed in float64 either way),
+  # or with dtype=np.float32 a compact copy for callers that store or ship many of them
 
-  tax_PRI = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Tax Revenue Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "C20"))]
+  data = model_inputs(data)
+  if assumptions is None:
+    assumptions = DEFAULT_ASSUMPTIONS
+  PRIcoef = assumptions.PRIcoef
+  CONcoef = assumptions.CONcoef
 
-  gdp_PRI = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Value-Added Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "C20"))]
-
-
-  # Engineering Construction [F] Multipliers
-  output_CON = multiplier[(multiplier['Country'] == location) &
-                          (multiplier['Multiplier Type'] == "Output Multiplier") &
-                          (multiplier['Sector'] == (location + "_" + "F"))]
+  Yrly_invsmt = np.asarray(Yrly_invsmt, dtype=np.float64)
+  pri_invsmt = np.zeros(project_life)
+  con_invsmt = np.zeros(project_life)
 
-  pay_CON = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Compensation (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "F"))]
+  pri_invsmt[:construction_prd] = PRIcoef * Yrly_invsmt[:construction_prd]
+  # pri_invsmt[construction_prd:] = Yrly_invsmt[construction_prd:]        
+  pri_invsmt[construction_prd:] = data.OPEX
+  con_invsmt[:construction_prd] = CONcoef * Yrly_invsmt[:construction_prd]
+  bank_invsmt = np.asarray(bank_chrg, dtype=np.float64)
 
-  job_CON = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Employment Elasticity (Jobs per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "F"))]
 
-  tax_CON = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Tax Revenue Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "F"))]
+ 
+  if isinstance(multiplier, pd.DataFrame):
+    multiplier = build_multiplier_index(multiplier)
 
-  gdp_CON = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Value-Added Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "F"))]
+  # Chemicals and Chemical Products [C20] Multipliers
+  pay_PRI = multiplier[(location, "C20", PAY_MULTIPLIER)]
+  job_PRI = multiplier[(location, "C20", JOB_MULTIPLIER)]
+  tax_PRI = multiplier[(location, "C20", TAX_MULTIPLIER)]
+  gdp_PRI = multiplier[(location, "C20", GDP_MULTIPLIER)]
 
+  # Engineering Construction [F] Multipliers
+  pay_CON = multiplier[(location, "F", PAY_MULTIPLIER)]
+  job_CON = multiplier[(location, "F", JOB_MULTIPLIER)]
+  gdp_CON = multiplier[(location, "F", GDP_MULTIPLIER)]
 
   # Financial and Insurance Services [K] Multipliers
-  output_BAN = multiplier[(multiplier['Country'] == location) &
-                          (multiplier['Multiplier Type'] == "Output Multiplier") &
-                          (multiplier['Sector'] == (location + "_" + "K"))]
-
-  pay_BAN = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Compensation (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "K"))]
-
-  job_BAN = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Employment Elasticity (Jobs per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "K"))]
-
-  tax_BAN = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Tax Revenue Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "K"))]
-
-  gdp_BAN = multiplier[(multiplier['Country'] == location) &
-                       (multiplier['Multiplier Type'] == "Value-Added Share (USD per million USD output)") &
-                       (multiplier['Sector'] == (location + "_" + "K"))]
-
-
-
-
-  pri_invsmt = pd.Series(pri_invsmt)
-  con_invsmt = pd.Series(con_invsmt)
-  bank_invsmt = pd.Series(bank_invsmt)
+  pay_BAN = multiplier[(location, "K", PAY_MULTIPLIER)]
+  job_BAN = multiplier[(location, "K", JOB_MULTIPLIER)]
+  gdp_BAN = multiplier[(location, "K", GDP_MULTIPLIER)]
 
   ####################### GDP Impacts BEGIN #####################
-  GDP_dirPRI = gdp_PRI['Direct Impact'].values[0] * pri_invsmt
-  GDP_dirCON = gdp_CON['Direct Impact'].values[0] * con_invsmt
-  GDP_dirBAN = gdp_BAN['Direct Impact'].values[0] * bank_invsmt
+  GDP_dirPRI = gdp_PRI[0] * pri_invsmt
+  GDP_dirCON = gdp_CON[0] * con_invsmt
+  GDP_dirBAN = gdp_BAN[0] * bank_invsmt
 
-  GDP_indPRI = gdp_PRI['Indirect Impact'].values[0] * pri_invsmt
-  GDP_indCON = gdp_CON['Indirect Impact'].values[0] * con_invsmt
-  GDP_indBAN = gdp_BAN['Indirect Impact'].values[0] * bank_invsmt
+  GDP_indPRI = gdp_PRI[1] * pri_invsmt
+  GDP_indCON = gdp_CON[1] * con_invsmt
+  GDP_indBAN = gdp_BAN[1] * bank_invsmt
 
-  GDP_totPRI = gdp_PRI['Total Impact'].values[0] * pri_invsmt
-  GDP_totCON = gdp_CON['Total Impact'].values[0] * con_invsmt
-  GDP_totBAN = gdp_BAN['Total Impact'].values[0] * bank_invsmt
+  GDP_totPRI = gdp_PRI[2] * pri_invsmt
+  GDP_totCON = gdp_CON[2] * con_invsmt
+  GDP_totBAN = gdp_BAN[2] * bank_invsmt
 
   GDP_dir = GDP_dirPRI + GDP_dirCON + GDP_dirBAN
   GDP_ind = GDP_indPRI + GDP_indCON + GDP_indBAN
@@ -847,17 +985,17 @@ def MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_
 
 
   ####################### Job Impacts BEGIN #####################
-  JOB_dirPRI = job_PRI['Direct Impact'].values[0] * pri_invsmt
-  JOB_dirCON = job_CON['Direct Impact'].values[0] * con_invsmt
-  JOB_dirBAN = job_BAN['Direct Impact'].values[0] * bank_invsmt
+  JOB_dirPRI = job_PRI[0] * pri_invsmt
+  JOB_dirCON = job_CON[0] * con_invsmt
+  JOB_dirBAN = job_BAN[0] * bank_invsmt
 
-  JOB_indPRI = job_PRI['Indirect Impact'].values[0] * pri_invsmt
-  JOB_indCON = job_CON['Indirect Impact'].values[0] * con_invsmt
-  JOB_indBAN = job_BAN['Indirect Impact'].values[0] * bank_invsmt
+  JOB_indPRI = job_PRI[1] * pri_invsmt
+  JOB_indCON = job_CON[1] * con_invsmt
+  JOB_indBAN = job_BAN[1] * bank_invsmt
 
-  JOB_totPRI = job_PRI['Total Impact'].values[0] * pri_invsmt
-  JOB_totCON = job_CON['Total Impact'].values[0] * con_invsmt
-  JOB_totBAN = job_BAN['Total Impact'].values[0] * bank_invsmt
+  JOB_totPRI = job_PRI[2] * pri_invsmt
+  JOB_totCON = job_CON[2] * con_invsmt
+  JOB_totBAN = job_BAN[2] * bank_invsmt
 
   JOB_dir = JOB_dirPRI + JOB_dirCON + JOB_dirBAN
   JOB_ind = JOB_indPRI + JOB_indCON + JOB_indBAN
@@ -867,17 +1005,17 @@ def MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_
 
 
   ####################### Wages & Salaries Impacts BEGIN #####################
-  PAY_dirPRI = pay_PRI['Direct Impact'].values[0] * pri_invsmt
-  PAY_dirCON = pay_CON['Direct Impact'].values[0] * con_invsmt
-  PAY_dirBAN = pay_BAN['Direct Impact'].values[0] * bank_invsmt
+  PAY_dirPRI = pay_PRI[0] * pri_invsmt
+  PAY_dirCON = pay_CON[0] * con_invsmt
+  PAY_dirBAN = pay_BAN[0] * bank_invsmt
 
-  PAY_indPRI = pay_PRI['Indirect Impact'].values[0] * pri_invsmt
-  PAY_indCON = pay_CON['Indirect Impact'].values[0] * con_invsmt
-  PAY_indBAN = pay_BAN['Indirect Impact'].values[0] * bank_invsmt
+  PAY_indPRI = pay_PRI[1] * pri_invsmt
+  PAY_indCON = pay_CON[1] * con_invsmt
+  PAY_indBAN = pay_BAN[1] * bank_invsmt
 
-  PAY_totPRI = pay_PRI['Total Impact'].values[0] * pri_invsmt
-  PAY_totCON = pay_CON['Total Impact'].values[0] * con_invsmt
-  PAY_totBAN = pay_BAN['Total Impact'].values[0] * bank_invsmt
+  PAY_totPRI = pay_PRI[2] * pri_invsmt
+  PAY_totCON = pay_CON[2] * con_invsmt
+  PAY_totBAN = pay_BAN[2] * bank_invsmt
 
   PAY_dir = PAY_dirPRI + PAY_dirCON + PAY_dirBAN
   PAY_ind = PAY_indPRI + PAY_indCON + PAY_indBAN
@@ -887,184 +1025,319 @@ def MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_
 
 
   ####################### Taxation Impacts (Potential Tax Revenues) BEGIN ################
-  TAX_dir = [0] * project_life
-  TAX_ind = [0] * project_life
-  TAX_tot = [0] * project_life
+  # Investment plus sales over the operating years; nothing is taxed during construction
+  tax_base = np.zeros(project_life)
+  tax_base[construction_prd:] = Yrly_invsmt[construction_prd:] + (Ps * np.asarray(prodQ, dtype=np.float64)[construction_prd:])
 
-  for i in range(construction_prd, project_life):
-      TAX_dir[i] = tax_PRI['Direct Impact'].values[0] * np.array(Yrly_invsmt[i] + (Ps * prodQ[i]))
-      TAX_ind[i] = tax_PRI['Indirect Impact'].values[0] * np.array(Yrly_invsmt[i] + (Ps * prodQ[i]))
-      TAX_tot[i] = tax_PRI['Total Impact'].values[0] * np.array(Yrly_invsmt[i] + (Ps * prodQ[i]))
+  TAX_dir = tax_PRI[0] * tax_base
+  TAX_ind = tax_PRI[1] * tax_base
+  TAX_tot = tax_PRI[2] * tax_base
 
 
-  return GDP_dir, GDP_ind, GDP_tot, JOB_dir, JOB_ind, JOB_tot, PAY_dir, PAY_ind, PAY_tot, TAX_dir, TAX_ind, TAX_tot, GDP_totPRI, JOB_totPRI, PAY_totPRI, GDP_dirPRI, JOB_dirPRI, PAY_dirPRI
+  impacts = (GDP_dir, GDP_ind, GDP_tot, JOB_dir, JOB_ind, JOB_tot, PAY_dir, PAY_ind, PAY_tot, TAX_dir, TAX_ind, TAX_tot, GDP_totPRI, JOB_totPRI, PAY_totPRI, GDP_dirPRI, JOB_dirPRI, PAY_dirPRI)
+  if dtype != np.float64:
+    impacts = tuple(series.astype(dtype) for series in impacts)
+  return impacts
   ####################### Taxation Impacts END ##################
 
+
+# Tensor axes of the multi-country macro stage: primary (chemicals), construction and financial services sectors,
+# and the multiplier types it reads; the last axis is (direct, indirect, total)
+MACRO_SECTORS = ("C20", "F", "K")
+MACRO_TYPES = (GDP_MULTIPLIER, JOB_MULTIPLIER, PAY_MULTIPLIER, TAX_MULTIPLIER)
+
+
+class MultiplierTensor(NamedTuple):
+  """
+  Dense multipliers as values[country, sector, multiplier type, impact] over countries x MACRO_SECTORS x MACRO_TYPES x
+  (direct, indirect, total), float64 with NaN where the table has no entry. Build one with build_multiplier_tensor().
+  """
+  countries: Tuple[str, ...]
+  values: np.ndarray
+
+  def positions(self, locations):
+    """Country axis positions of `locations`; KeyError for countries without multipliers"""
+    lookup = {country: i for i, country in enumerate(self.countries)}
+    return [lookup[location] for location in locations]
+
+
+def build_multiplier_tensor(multiplier, countries=None):
+  """MultiplierTensor from the multipliers table or its build_multiplier_index() dict, for `countries` (default: all)"""
+  if isinstance(multiplier, pd.DataFrame):
+    multiplier = build_multiplier_index(multiplier)
+  if countries is None:
+    countries = sorted({country for country, _, _ in multiplier})
+  countries = tuple(countries)
+
+  values = np.full((len(countries), len(MACRO_SECTORS), len(MACRO_TYPES), 3), np.nan)
+  for c, country in enumerate(countries):
+    for s, sector in enumerate(MACRO_SECTORS):
+      for t, mtype in enumerate(MACRO_TYPES):
+        impacts = multiplier.get((country, sector, mtype))
+        if impacts is not None:
+          values[c, s, t] = impacts
+  values.flags.writeable = False
+  return MultiplierTensor(countries, values)
+
+
+def MacroEconomic_Impacts_Countries(tensor, data, locations, prodQ, Ps, project_life, construction_prd, Yrly_invsmt, bank_chrg, assumptions=None, dtype=np.float64):
+  """
+  MacroEconomic_Impacts for several locations at once: the GDP/JOB/PAY impacts of every country, sector, multiplier type
+  and direct/indirect/total are one broadcast product of the multiplier tensor with the (sector x year) investment matrix.
+  Returns {location: the MacroEconomic_Impacts tuple}, with every series a contiguous `dtype` array of length project_life.
+  """
+  data = model_inputs(data)
+  if assumptions is None:
+    assumptions = DEFAULT_ASSUMPTIONS
+  if not isinstance(tensor, MultiplierTensor):
+    tensor = build_multiplier_tensor(tensor)
+  locations = list(locations)
+  multipliers = tensor.values[tensor.positions(locations)]
+
+  # The scalar stage fails with a KeyError on a missing multiplier; so does this one
+  required = np.ones(multipliers.shape[1:3], dtype=bool)
+  required[1:, MACRO_TYPES.index(TAX_MULTIPLIER)] = False  # only the primary sector's tax multipliers are used
+  missing = np.isnan(multipliers).any(axis=-1) & required
+  if missing.any():
+    c, s, t = np.argwhere(missing)[0]
+    raise KeyError((locations[c], MACRO_SECTORS[s], MACRO_TYPES[t]))
+
+  # Investment per sector and year: primary (construction share, then OPEX), construction, and bank charges
+  Yrly_invsmt = np.asarray(Yrly_invsmt, dtype=np.float64)
+  invsmt = np.zeros((len(MACRO_SECTORS), project_life))
+  invsmt[0, :construction_prd] = assumptions.PRIcoef * Yrly_invsmt[:construction_prd]
+  invsmt[0, construction_prd:] = data.OPEX
+  invsmt[1, :construction_prd] = assumptions.CONcoef * Yrly_invsmt[:construction_prd]
+  invsmt[2] = bank_chrg
+
+  # impacts[country, sector, type, impact, year]; sectors are summed in the scalar stage's order (PRI + CON + BAN)
+  impacts = multipliers[:, :, :3, :, None] * invsmt[None, :, None, None, :]
+  totals = impacts[:, 0] + impacts[:, 1] + impacts[:, 2]
+  primary = impacts[:, 0]
+
+  # Tax revenue on investment plus sales over the operating years, primary sector only
+  tax_base = np.zeros(project_life)
+  tax_base[construction_prd:] = Yrly_invsmt[construction_prd:] + Ps * np.asarray(prodQ, dtype=np.float64)[construction_prd:]
+  taxes = multipliers[:, 0, 3, :, None] * tax_base
+  if dtype != np.float64:
+    totals, primary, taxes = totals.astype(dtype), primary.astype(dtype), taxes.astype(dtype)
+
+  GDP, JOB, PAY = 0, 1, 2
+  results = {}
+  for c, location in enumerate(locations):
+    t, p, tax = totals[c], primary[c], taxes[c]
+    results[location] = (t[GDP, 0], t[GDP, 1], t[GDP, 2], t[JOB, 0], t[JOB, 1], t[JOB, 2], t[PAY, 0], t[PAY, 1], t[PAY, 2],
+                         tax[0], tax[1], tax[2], p[GDP, 2], p[JOB, 2], p[PAY, 2], p[GDP, 0], p[JOB, 0], p[PAY, 0])
+  return results
+
+
+def MacroEconomic_Model_Countries(multiplier, data, locations, plant_mode, fund_mode, opex_mode, carbon_value, assumptions=None, dtype=np.float64):
+  """
+  MacroEconomic_Model for the same project in several locations: the process and micro models run once and the macro
+  stage once for all locations. `multiplier` may be the table, its index dict or a prebuilt MultiplierTensor.
+  """
+  process = ChemProcess_Model(data, assumptions)
+  Ps, _, _, _, _, _, _, _, _, _, _, _, _, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, _, _ = MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value, process=process, assumptions=assumptions)
+
+  return MacroEconomic_Impacts_Countries(multiplier, data, locations, process[0], Ps, project_life, construction_prd, Yrly_invsmt, bank_chrg, assumptions, dtype)
+
 ############################################################# MACROECONOMIC MODEL ENDS ############################################################
-def Analytics_Model2(multiplier, project_data, location, product, plant_mode, fund_mode, opex_mode, carbon_value, plant_size, plant_effy):
+
+RESULT_COLUMNS = (
+    'Year', 'Process Technology', 'Plant Size', 'Plant Efficiency', 'Feedstock Input (TPA)', 'Product Output (TPA)',
+    'Direct GHG Emissions (TPA)', 'Cost Mode', 'Real cumCash Flow', 'Nominal cumCash Flow', 'Constant$ Breakeven Price',
+    'Capex portion', 'Opex portion', 'Feed portion', 'Util portion', 'Bank portion', 'Tax portion', 'Other portion',
+    'Current$ Breakeven Price', 'Constant$ SC wCredit', 'Current$ SC wCredit', 'Project Finance', 'Carbon Valued',
+    'Feedstock Price ($/t)', 'pri_directGDP', 'pri_bothGDP', 'All_directGDP', 'All_bothGDP', 'pri_directPAY', 'pri_bothPAY',
+    'All_directPAY', 'All_bothPAY', 'pri_directJOB', 'pri_bothJOB', 'All_directJOB', 'All_bothJOB', 'pri_directTAX', 'pri_bothTAX'
+)
+
+# Columns holding one value per project row (Analytics_Row returns them as scalars); the others are yearly series
+ROW_CONSTANT_COLUMNS = (
+    'Process Technology', 'Plant Size', 'Plant Efficiency', 'Cost Mode', 'Constant$ Breakeven Price', 'Capex portion',
+    'Opex portion', 'Feed portion', 'Util portion', 'Bank portion', 'Tax portion', 'Other portion', 'Constant$ SC wCredit',
+    'Project Finance', 'Carbon Valued', 'Feedstock Price ($/t)'
+)
+
+# Columns that are not float64
+RESULT_DTYPES = {
+    'Year': np.int64,
+    'Process Technology': object,
+    'Plant Size': object,
+    'Plant Efficiency': object,
+    'Cost Mode': object,
+    'Project Finance': object,
+    'Carbon Valued': object,
+}
+
+
+def Analytics_Row(multiplier, data, location, plant_mode, fund_mode, opex_mode, carbon_value, assumptions=None):
     """
-    Performs economic analysis for a chemical plant.
-    This function has been updated to gracefully handle optional 'product', 'plant_size', and 'plant_effy' parameters.
+    Runs the process, micro and macro models once for a single project row and returns its Analytics_Model2 columns.
+    Yearly series are arrays of length project_life; values that are constant over the project are scalars.
     """
+    if assumptions is None:
+        assumptions = DEFAULT_ASSUMPTIONS
+    Infl = assumptions.infl
+    tempNUM = 1000000
 
-    # --- START OF UPDATED FILTERING LOGIC ---
-    # The 'project_data' passed to this function is the 'custom_data' DataFrame
-    # created in the API, which is a single-row DataFrame containing all
-    # payload-provided parameters.
+    # Single pass: the process and micro results feed the macro stage directly; the model inputs are converted once
+    inputs = model_inputs(data)
+    process = timed_stage('process', ChemProcess_Model, inputs, assumptions)
+    prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind = process
+    Ps, Pso, Pc, Pco, capexContr, opexContr, feedContr, utilContr, bankContr, taxContr, otherContr, cshflw, cshflw2, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, NetRevn, tax_pybl = timed_stage('micro', MicroEconomic_Model, inputs, plant_mode, fund_mode, opex_mode, carbon_value, process=process, assumptions=assumptions)
+    GDP_dir, GDP_ind, GDP_tot, JOB_dir, JOB_ind, JOB_tot, PAY_dir, PAY_ind, PAY_tot, TAX_dir, TAX_ind, TAX_tot, GDP_totPRI, JOB_totPRI, PAY_totPRI, GDP_dirPRI, JOB_dirPRI, PAY_dirPRI = timed_stage('macro', MacroEconomic_Impacts, multiplier, inputs, location, prodQ, Ps, project_life, construction_prd, Yrly_invsmt, bank_chrg, assumptions)
 
-    # Create a copy to avoid modifying the original
-    dt_filtered = project_data.copy()
-    
-    # Apply filters only if parameters are provided and not empty
-    if location:
-        dt_filtered = dt_filtered[dt_filtered['Country'] == location]
-    
-    if product and product != "":
-        dt_filtered = dt_filtered[dt_filtered['Main_Prod'] == product]
-    
-    if plant_size and plant_size != "":
-        dt_filtered = dt_filtered[dt_filtered['Plant_Size'] == plant_size]
-    
-    if plant_effy and plant_effy != "":
-        dt_filtered = dt_filtered[dt_filtered['Plant_Effy'] == plant_effy]
+    Yrly_cost = np.array(Yrly_invsmt) + np.array(bank_chrg)
 
-    # If filtering resulted in empty DataFrame and we have custom data (single row), use that instead
-    if dt_filtered.empty and len(project_data) == 1:
-        dt = project_data
-    else:
-        dt = dt_filtered
+    inflF = compound_factors(Infl, project_life)
+    Psk = Pso * inflF
+    Pck = Pco * inflF
 
-    # If still empty, return empty DataFrame
-    if dt.empty:
-        print(f"Warning: No data found for the specified filters. Returning empty DataFrame.")
-        return pd.DataFrame()
-    # --- END OF UPDATED FILTERING LOGIC ---
+    ccflows = np.cumsum(Ps * prodQ - Yrly_cost)
+    ccflowsk = np.cumsum(Psk * prodQ - Yrly_cost)
 
-    Infl = 0.02
-    tempNUM = 1000000
-    results = []
-    
-    for index, data in dt.iterrows():
+    if plant_mode == "Green":
+        cost_mode = "Supply Cost"
+    else:
+        cost_mode = "Cash Cost"
+
+    return {
+        'Year': Year,
+        'Process Technology': data['ProcTech'],
+        'Plant Size': data['Plant_Size'],
+        'Plant Efficiency': data['Plant_Effy'],
+        'Feedstock Input (TPA)': feedQ,
+        'Product Output (TPA)': prodQ,
+        'Direct GHG Emissions (TPA)': ghg_dir,
+        'Cost Mode': cost_mode,
+        'Real cumCash Flow': ccflows,
+        'Nominal cumCash Flow': ccflowsk,
+        'Constant$ Breakeven Price': Ps,
+        'Capex portion': capexContr,
+        'Opex portion': opexContr,
+        'Feed portion': feedContr,
+        'Util portion': utilContr,
+        'Bank portion': bankContr,
+        'Tax portion': taxContr,
+        'Other portion': otherContr,
+        'Current$ Breakeven Price': Psk,
+        'Constant$ SC wCredit': Pc,
+        'Current$ SC wCredit': Pck,
+        'Project Finance': fund_mode,
+        'Carbon Valued': carbon_value,
+        'Feedstock Price ($/t)': inputs.Feed_Price,
+        'pri_directGDP': GDP_dirPRI / tempNUM,
+        'pri_bothGDP': GDP_totPRI / tempNUM,
+        'All_directGDP': GDP_dir / tempNUM,
+        'All_bothGDP': GDP_tot / tempNUM,
+        'pri_directPAY': PAY_dirPRI / tempNUM,
+        'pri_bothPAY': PAY_totPRI / tempNUM,
+        'All_directPAY': PAY_dir / tempNUM,
+        'All_bothPAY': PAY_tot / tempNUM,
+        'pri_directJOB': JOB_dirPRI / tempNUM,
+        'pri_bothJOB': JOB_totPRI / tempNUM,
+        'All_directJOB': JOB_dir / tempNUM,
+        'All_bothJOB': JOB_tot / tempNUM,
+        'pri_directTAX': TAX_dir / tempNUM,
+        'pri_bothTAX': TAX_tot / tempNUM
+    }
+
+
+SELECTOR_KEYS = ('Country', 'Main_Prod', 'Plant_Size', 'Plant_Effy')
+
+
+class ProjectSelector:
+    """
+    Prebuilt lookup over the Country / Main_Prod / Plant_Size / Plant_Effy columns of a project_data table.
+    Every combination of key values and wildcards maps to the matching row positions, so a scenario lookup is one
+    dict access instead of a copy and four boolean filters. Rows are handed out as plain dicts built from the column
+    lists rather than boxed pandas Series.
+    """
+    __slots__ = ('columns', 'length', '_positions')
+
+    def __init__(self, project_data):
+        self.columns = {name: project_data[name].tolist() for name in project_data.columns}
+        self.length = len(project_data)
+        self._positions = {}
+        keys = [self.columns.get(name, [None] * self.length) for name in SELECTOR_KEYS]
+        for position, values in enumerate(zip(*keys)):
+            # dict.fromkeys drops the repeated keys produced when a row's own value is None
+            for key in dict.fromkeys(cartesian_product(*[(value, None) for value in values])):
+                self._positions.setdefault(key, []).append(position)
+        self._positions = {key: tuple(positions) for key, positions in self._positions.items()}
+
+    def __len__(self):
+        return self.length
+
+    def select(self, location, product, plant_size, plant_effy):
+        """
+        Row positions matching the optional filters; empty or None filters match everything.
+        """
+        key = tuple(value if value else None for value in (location, product, plant_size, plant_effy))
+        positions = self._positions.get(key, ())
+
+        # If filtering found nothing and we have custom data (single row), use that instead
+        if not positions and self.length == 1:
+            positions = (0,)
+
+        if not positions:
+            print(f"Warning: No data found for the specified filters. Returning empty DataFrame.")
+        return positions
+
+    def record(self, position):
+        """The row at `position` as a {column: value} dict"""
+        return {name: values[position] for name, values in self.columns.items()}
+
+
+def Analytics_Rows(multiplier, selector, positions, location, plant_mode, fund_mode, opex_mode, carbon_value, assumptions=None):
+    """
+    Generator over the selector rows at `positions` that yields (position, Analytics_Row columns) as soon as each row
+    is evaluated, so callers can stream results instead of waiting for the whole table. Rows whose models fail are skipped.
+    """
+    if isinstance(multiplier, pd.DataFrame):
+        multiplier = build_multiplier_index(multiplier)
+
+    for position in positions:
+        data = selector.record(position)
         try:
-            prodQ, feedQ, Rheat, netHeat, Relec, ghg_dir, ghg_ind = ChemProcess_Model(data)
-            Ps, Pso, Pc, Pco, capexContr, opexContr, feedContr, utilContr, bankContr, taxContr, otherContr, cshflw, cshflw2, Year, project_life, construction_prd, Yrly_invsmt, bank_chrg, NetRevn, tax_pybl = MicroEconomic_Model(data, plant_mode, fund_mode, opex_mode, carbon_value)
-            GDP_dir, GDP_ind, GDP_tot, JOB_dir, JOB_ind, JOB_tot, PAY_dir, PAY_ind, PAY_tot, TAX_dir, TAX_ind, TAX_tot, GDP_totPRI, JOB_totPRI, PAY_totPRI, GDP_dirPRI, JOB_dirPRI, PAY_dirPRI = MacroEconomic_Model(multiplier, data, location, plant_mode, fund_mode, opex_mode, carbon_value)
+            row = Analytics_Row(multiplier, data, location, plant_mode, fund_mode, opex_mode, carbon_value, assumptions)
         except Exception as e:
-            print(f"Error during model execution for data row: {data.to_dict()}. Error: {e}")
+            print(f"Error during model execution for data row: {data}. Error: {e}")
             continue
+        yield position, row
 
-        Yrly_cost = np.array(Yrly_invsmt) + np.array(bank_chrg)
-
-        Ps = [Ps] * project_life
-        Pc = [Pc] * project_life
-        Psk = [0] * project_life
-        Pck = [0] * project_life
 
-        for i in range(project_life):
-            Psk[i] = Pso * ((1 + Infl) ** i)
-            Pck[i] = Pco * ((1 + Infl) ** i)
+def Analytics_Model2(multiplier, project_data, location, product, plant_mode, fund_mode, opex_mode, carbon_value, plant_size, plant_effy, assumptions=None):
+    """
+    Performs economic analysis for a chemical plant.
+    This function has been updated to gracefully handle optional 'product', 'plant_size', and 'plant_effy' parameters.
+    """
+    # project_data may be a DataFrame or a ProjectSelector built once over it
+    if isinstance(project_data, ProjectSelector):
+        selector = project_data
+    else:
+        selector = ProjectSelector(project_data)
+    positions = selector.select(location, product, plant_size, plant_effy)
 
-        Rs = [Ps[i] * prodQ[i] for i in range(project_life)]
-        NRs = [Rs[i] - Yrly_cost[i] for i in range(project_life)]
+    # If still empty, return empty DataFrame
+    if not positions:
+        return pd.DataFrame()
 
-        Rsk = Psk * prodQ
-        NRsk = Rsk - Yrly_cost
+    # Columnar result builder: every row's yearly values are written into one preallocated set of column arrays
+    columns = None
+    filled = 0
 
-        ccflows = np.cumsum(NRs)
-        ccflowsk = np.cumsum(NRsk)
+    for position, row in Analytics_Rows(multiplier, selector, positions, location, plant_mode, fund_mode, opex_mode, carbon_value, assumptions):
+        project_life = len(row['Year'])
+        if columns is None:
+            capacity = len(positions) * project_life
+            columns = {name: np.empty(capacity, dtype=RESULT_DTYPES.get(name, np.float64)) for name in RESULT_COLUMNS}
+        for name in RESULT_COLUMNS:
+            columns[name][filled:filled + project_life] = row[name]
+        filled += project_life
 
-        cost_modes = ["Supply Cost", "Cash Cost"]
-        if plant_mode == "Green":
-            cost_mode = cost_modes[0]
-        else:
-            cost_mode = cost_modes[1]
-
-        pri_bothJOB = [0] * project_life
-        pri_directJOB = [0] * project_life
-        pri_indirectJOB = [0] * project_life
-
-        All_directJOB = [0] * project_life
-        All_indirectJOB = [0] * project_life
-        All_bothJOB = [0] * project_life
-
-        pri_bothGDP = GDP_totPRI
-        pri_directGDP = GDP_dirPRI
-        pri_indirectGDP = GDP_totPRI - GDP_dirPRI
-        All_bothGDP = GDP_tot
-        All_directGDP = GDP_dir
-        All_indirectGDP = GDP_tot - GDP_dir
-
-        pri_bothTAX = TAX_tot
-        pri_directTAX = TAX_dir
-        pri_indirectTAX = TAX_ind
-
-        pri_bothPAY = PAY_totPRI
-        pri_directPAY = PAY_dirPRI
-        pri_indirectPAY = PAY_totPRI - PAY_dirPRI
-        All_bothPAY = PAY_tot
-        All_directPAY = PAY_dir
-        All_indirectPAY = PAY_tot - PAY_dir
-
-        pri_bothJOB[construction_prd:] = JOB_totPRI[construction_prd:]
-        pri_directJOB[construction_prd:] = JOB_dirPRI[construction_prd:]
-        pri_indirectJOB[construction_prd:] = JOB_totPRI[construction_prd:] - JOB_dirPRI[construction_prd:]
-
-        pri_bothJOB[:construction_prd] = JOB_totPRI[:construction_prd]
-        pri_directJOB[:construction_prd] = JOB_dirPRI[:construction_prd]
-        pri_indirectJOB[:construction_prd] = JOB_totPRI[:construction_prd] - JOB_dirPRI[:construction_prd]
-
-        All_bothJOB[construction_prd:] = JOB_tot[construction_prd:]
-        All_directJOB[construction_prd:] = JOB_dir[construction_prd:]
-        All_indirectJOB[construction_prd:] = JOB_tot[construction_prd:] - JOB_dir[construction_prd:]
-
-        All_bothJOB[:construction_prd] = JOB_tot[:construction_prd]
-        All_directJOB[:construction_prd] = JOB_dir[:construction_prd]
-        All_indirectJOB[:construction_prd] = JOB_tot[:construction_prd] - JOB_dir[:construction_prd]
-
-        result = pd.DataFrame({
-            'Year': Year,
-            'Process Technology': [data['ProcTech']] * project_life,
-            'Plant Size': [data['Plant_Size']] * project_life,
-            'Plant Efficiency': [data['Plant_Effy']] * project_life,
-            'Feedstock Input (TPA)': feedQ,
-            'Product Output (TPA)': prodQ,
-            'Direct GHG Emissions (TPA)': ghg_dir,
-            'Cost Mode': [cost_mode] * project_life,
-            'Real cumCash Flow': ccflows,
-            'Nominal cumCash Flow': ccflowsk,
-            'Constant$ Breakeven Price': Ps,
-            'Capex portion': [capexContr] * project_life,
-            'Opex portion': [opexContr] * project_life,
-            'Feed portion': [feedContr] * project_life,
-            'Util portion': [utilContr] * project_life,
-            'Bank portion': [bankContr] * project_life,
-            'Tax portion': [taxContr] * project_life,
-            'Other portion': [otherContr] * project_life,
-            'Current$ Breakeven Price': Psk,
-            'Constant$ SC wCredit': Pc,
-            'Current$ SC wCredit': Pck,
-            'Project Finance': [fund_mode] * project_life,
-            'Carbon Valued': [carbon_value] * project_life,
-            'Feedstock Price ($/t)': [data['Feed_Price']] * project_life,
-            'pri_directGDP': np.array(pri_directGDP)/tempNUM,
-            'pri_bothGDP': np.array(pri_bothGDP)/tempNUM,
-            'All_directGDP': np.array(All_directGDP)/tempNUM,
-            'All_bothGDP': np.array(All_bothGDP)/tempNUM,
-            'pri_directPAY': np.array(pri_directPAY)/tempNUM,
-            'pri_bothPAY': np.array(pri_bothPAY)/tempNUM,
-            'All_directPAY': np.array(All_directPAY)/tempNUM,
-            'All_bothPAY': np.array(All_bothPAY)/tempNUM,
-            'pri_directJOB': np.array(pri_directJOB)/tempNUM,
-            'pri_bothJOB': np.array(pri_bothJOB)/tempNUM,
-            'All_directJOB': np.array(All_directJOB)/tempNUM,
-            'All_bothJOB': np.array(All_bothJOB)/tempNUM,
-            'pri_directTAX': np.array(pri_directTAX)/tempNUM,
-            'pri_bothTAX': np.array(pri_bothTAX)/tempNUM
-        })
-        results.append(result)
-
-    if not results:
+    if columns is None:
         return pd.DataFrame()
 
-    results = pd.concat(results, ignore_index=True)
-    return results
+    return timed_stage('frame', pd.DataFrame, {name: values[:filled] for name, values in columns.items()})
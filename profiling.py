@@ -0,0 +1,89 @@
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9A-Za-z-]+$")
+
+
+def profiled_call(target, **kwargs):
+    """Worker entry point: target(**kwargs) under cProfile; returns (result, marshalled pstats data)"""
+    profile = cProfile.Profile()
+    result = profile.runcall(target, **kwargs)
+    profile.create_stats()
+    return result, marshal.dumps(profile.stats)
+
+
+class ProfileLimiter:
+    """Allows one profiled request per `interval` seconds"""
+
+    def __init__(self, interval=60.0):
+        self.interval = interval
+        self._last = None
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """True if a profile may run now (and starts the next interval), else False"""
+        now = time.monotonic()
+        with self._lock:
+            if self._last is not None and now - self._last < self.interval:
+                return False
+            self._last = now
+            return True
+
+    def retry_after(self):
+        """Seconds until the next profile is allowed"""
+        if self._last is None:
+            return 0
+        return max(0, int(self._last + self.interval - time.monotonic()) + 1)
+
+
+class ProfileStore:
+    """
+    Profiles saved as <id>.prof (pstats dump, readable with `python -m pstats` or snakeviz) plus <id>.txt
+    (the request payload and the top functions by cumulative time). Only the newest `keep` profiles are kept.
+    """
+
+    def __init__(self, directory, keep=50, top=40):
+        self.directory = directory
+        self.keep = keep
+        self.top = top
+
+    def save(self, stats_data: bytes, payload: dict) -> str:
+        """Write one profile and return its id"""
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        prof_path = self.path(profile_id, "prof")
+        with open(prof_path, "wb") as f:
+            f.write(stats_data)
+
+        summary = io.StringIO()
+        summary.write(f"Profile {profile_id}\nPayload: {json.dumps(payload, sort_keys=True, default=str)}\n\n")
+        pstats.Stats(prof_path, stream=summary).sort_stats("cumulative").print_stats(self.top)
+        with open(self.path(profile_id, "txt"), "w") as f:
+            f.write(summary.getvalue())
+
+        self._prune()
+        return profile_id
+
+    def path(self, profile_id: str, kind: str) -> str:
+        """File of a stored profile; kind is "prof" or "txt". Raises ValueError for malformed ids"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise ValueError(f"Invalid profile id: {profile_id}")
+        return os.path.join(self.directory, f"{profile_id}.{kind}")
+
+    def _prune(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".prof")]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - self.keep)]:
+            for kind in ("prof", "txt"):
+                try:
+                    os.remove(path[:-len("prof")] + kind)
+                except FileNotFoundError:
+                    pass
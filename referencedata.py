@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import pandas as pd
+
+from originalmodel import build_multiplier_index
+from resultcache import file_version
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """
+    One immutable snapshot of the reference data files. A request should take a snapshot once and use it throughout,
+    so a concurrent reload never mixes two versions of the data.
+    """
+    version: str
+    countries: frozenset
+    products: frozenset
+    # Plain dict rather than a mapping proxy because it is pickled to the model worker processes; treat it as read-only
+    multiplier_index: dict
+    # {country: {parameter: value}}, e.g. country_info["SAU"]["Tax_Corps"] == 0.2
+    country_info: MappingProxyType
+
+
+def parse_country_info(path) -> MappingProxyType:
+    """Country_Info table (Name, Country, Parameter, Value with values like "20.0%") as {country: {parameter: fraction}}"""
+    table = pd.read_csv(path, encoding="utf-8-sig")
+    info = {}
+    for country, parameter, value in zip(table["Country"], table["Parameter"], table["Value"]):
+        value = str(value).strip()
+        number = float(value.rstrip("%")) / 100 if value.endswith("%") else float(value)
+        info.setdefault(country, {})[parameter] = number
+    return MappingProxyType({country: MappingProxyType(values) for country, values in info.items()})
+
+
+def load_reference_data(project_data_file, multipliers_file, country_info_file) -> ReferenceData:
+    """Parse and index all reference files into a new snapshot; raises if any file is missing or malformed"""
+    project_data = pd.read_csv(project_data_file)
+    multipliers = pd.read_csv(multipliers_file)
+    return ReferenceData(
+        version=file_version(project_data_file, multipliers_file, country_info_file),
+        countries=frozenset(project_data["Country"]),
+        products=frozenset(project_data["Main_Prod"]),
+        multiplier_index=build_multiplier_index(multipliers),
+        country_info=parse_country_info(country_info_file),
+    )
+
+
+class ReferenceDataStore:
+    """
+    Holds the current ReferenceData snapshot and swaps in a new one when a file's modification time changes.
+    File times are checked at most every `check_interval` seconds. Changed files are parsed on a background thread
+    while callers keep getting the previous snapshot; a failed reload keeps serving it. `on_reload(old, new)` is called
+    after every swap.
+    """
+
+    def __init__(self, project_data_file, multipliers_file, country_info_file, check_interval=5.0, on_reload=None):
+        self.paths = (project_data_file, multipliers_file, country_info_file)
+        self.check_interval = check_interval
+        self.on_reload = on_reload
+        self._data = None
+        self._mtimes = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._reloading = threading.Lock()
+
+    @property
+    def version(self):
+        return self._data.version if self._data is not None else None
+
+    def load(self) -> ReferenceData:
+        """(Re)load every file now and publish the new snapshot"""
+        with self._lock:
+            return self._load()
+
+    def current(self) -> ReferenceData:
+        """The current snapshot; starts a background reload if the files changed since the last check"""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._load()
+            return self._data
+
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            if self._file_mtimes() != self._mtimes and self._reloading.acquire(blocking=False):
+                threading.Thread(target=self._reload, name="reference-data-reload", daemon=True).start()
+        return self._data
+
+    def _reload(self):
+        try:
+            with self._lock:
+                self._load()
+        except Exception:
+            logger.exception(f"Reloading reference data failed, keeping version {self._data.version}")
+        finally:
+            self._reloading.release()
+
+    def _file_mtimes(self):
+        try:
+            return tuple(os.stat(path).st_mtime_ns for path in self.paths)
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        mtimes = self._file_mtimes()
+        data = load_reference_data(*self.paths)
+        old, self._data, self._mtimes = self._data, data, mtimes
+        if self.on_reload is not None and old is not None and old.version != data.version:
+            self.on_reload(old, data)
+        return data
@@ -0,0 +1,60 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+from datetime import datetime, timezone
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; structured fields passed as extra={"fields": {...}} are merged into it"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(path, max_bytes=10 * 2**20, backup_count=5, level=logging.INFO, console=True):
+    """
+    Route all logging through a queue so callers (e.g. the event loop) only enqueue records; a background listener
+    thread writes them as JSON lines to a size-rotated file and, optionally, as plain text to the console.
+    Returns the started QueueListener, which is stopped (and flushed) at interpreter exit.
+    """
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
+
+
+def stop_listener(listener):
+    """Flush queued records and stop the writer thread; safe to call more than once"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def sample(rate):
+    """True for a `rate` fraction of calls (0 never, 1 always)"""
+    return rate >= 1 or (rate > 0 and random.random() < rate)
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def payload_key(config: dict, version: str) -> str:
+    """Canonical hash of a validated payload plus the version stamp of the reference data it ran against"""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{version}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def file_version(*paths) -> str:
+    """Version stamp for a set of data files, derived from their contents"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    In-process LRU cache with a time-to-live for analysis results, optionally backed by an SQLite file
+    so entries survive restarts and are shared between API processes.
+    Values must be JSON serializable (e.g. the list of records returned by /analyze).
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600.0, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stored REAL, value TEXT)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_stored ON results (stored)")
+            self._db.commit()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or an expired entry"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT stored, value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[0] <= self.ttl:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+                elif row is not None:
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO results (key, stored, value) VALUES (?, ?, ?)",
+                                 (key, entry[0], json.dumps(value)))
+                self._prune_db(entry[0])
+                self._db.commit()
+
+    def clear(self):
+        """Drop every entry, e.g. after the reference data files were reloaded"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "disk_backed": self._db is not None,
+            }
+
+    def _prune_db(self, now):
+        """Delete expired rows and all but the newest max_entries rows, so the SQLite file stays bounded like the LRU"""
+        self._db.execute("DELETE FROM results WHERE stored < ?", (now - self.ttl,))
+        self._db.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY stored DESC LIMIT -1 OFFSET ?)",
+                         (self.max_entries,))
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
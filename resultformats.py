@@ -0,0 +1,117 @@
+import io
+import json
+
+import pandas as pd
+
+from originalmodel import RESULT_COLUMNS, ROW_CONSTANT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, only needed for the Arrow IPC and Parquet formats
+    pa = None
+    pq = None
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNS_MEDIA_TYPE = "application/vnd.ipem.columns+json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Accept header values understood by the analysis endpoints -> canonical media type
+MEDIA_TYPES = {
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    COLUMNS_MEDIA_TYPE: COLUMNS_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+    "application/vnd.apache.arrow.file": ARROW_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE: PARQUET_MEDIA_TYPE,
+    "application/x-parquet": PARQUET_MEDIA_TYPE,
+}
+PYARROW_MEDIA_TYPES = (ARROW_MEDIA_TYPE, PARQUET_MEDIA_TYPE)
+
+
+class UnsupportedFormat(ValueError):
+    """The Accept header only names formats this server cannot produce"""
+
+
+def negotiate_format(accept) -> str:
+    """
+    Pick the response media type from an Accept header, honouring q-values.
+    A missing header, */* or only unrecognised types fall back to record-oriented JSON; asking only for
+    Arrow/Parquet while pyarrow is not installed raises UnsupportedFormat.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    offers = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            offers.append((-quality, position, media_type.lower()))
+
+    unavailable = []
+    for _, _, media_type in sorted(offers):
+        if media_type in ("*/*", "application/*"):
+            return JSON_MEDIA_TYPE
+        canonical = MEDIA_TYPES.get(media_type)
+        if canonical is None:
+            continue
+        if canonical in PYARROW_MEDIA_TYPES and pa is None:
+            unavailable.append(media_type)
+            continue
+        return canonical
+
+    if unavailable:
+        raise UnsupportedFormat(f"{', '.join(unavailable)} requires pyarrow, which is not installed")
+    return JSON_MEDIA_TYPE
+
+
+def column_frame(results) -> dict:
+    """
+    Column-oriented JSON shape of a single project row's analysis result: the ROW_CONSTANT_COLUMNS
+    (e.g. 'Capex portion', 'Project Finance') are stored once under "constants", the yearly series as lists under "columns".
+    Which columns are constants depends only on the result schema, never on the values.
+    """
+    frame = results if isinstance(results, pd.DataFrame) else pd.DataFrame.from_records(results)
+    constants = {}
+    columns = {}
+    for name in frame.columns:
+        if name in ROW_CONSTANT_COLUMNS:
+            first = frame[name].iloc[:1].tolist()
+            constants[name] = first[0] if first else None
+        else:
+            columns[name] = frame[name].tolist()
+    return {"rows": len(frame), "constants": constants, "columns": columns}
+
+
+def frame_from_columns(payload: dict) -> pd.DataFrame:
+    """Inverse of column_frame: the result DataFrame, columns in RESULT_COLUMNS order"""
+    rows = payload["rows"]
+    data = {name: [value] * rows for name, value in payload["constants"].items()}
+    data.update(payload["columns"])
+    order = [name for name in RESULT_COLUMNS if name in data] + [name for name in data if name not in RESULT_COLUMNS]
+    return pd.DataFrame({name: data[name] for name in order})
+
+
+def encode_frame(frame: pd.DataFrame, media_type: str) -> bytes:
+    """Serialize a result DataFrame to Arrow IPC stream or Parquet bytes"""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    if media_type == ARROW_MEDIA_TYPE:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif media_type == PARQUET_MEDIA_TYPE:
+        pq.write_table(table, sink)
+    else:
+        raise ValueError(f"Unsupported binary media type: {media_type}")
+    return sink.getvalue()
+
+
+def encode_columns(payload) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
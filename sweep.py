@@ -0,0 +1,173 @@
+"""
+Full-dataset sweep: runs every row of project_data.csv through the analytics model for every combination of
+plant_mode, fund_mode, opex_mode and carbon_value, sharded over a process pool.
+
+Results are written incrementally as partitioned files in the model_results.csv column layout, e.g.
+
+    sweep_results/plant_mode=Green/fund_mode=Debt/opex_mode=Inflated/carbon_value=Yes/part-00000-00010.csv
+
+and every finished shard is appended to a checkpoint file, so re-running the same command after the job was
+killed only computes the missing shards.
+
+    python sweep.py --out sweep_results --workers 8 --format parquet
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from originalmodel import Analytics_Rows, ProjectSelector, build_multiplier_index, RESULT_COLUMNS, RESULT_DTYPES
+from resultcache import file_version
+
+PLANT_MODES = ("Green", "Brown")
+FUND_MODES = ("Debt", "Equity", "Mixed")
+OPEX_MODES = ("Inflated", "Uninflated")
+CARBON_VALUES = ("Yes", "No")
+
+# Leading columns identifying the project_data row each result row belongs to
+KEY_COLUMNS = ("Row", "Country", "Main_Prod")
+CHECKPOINT_FILE = "_checkpoint.ndjson"
+
+# Per-worker reference data, loaded once by init_worker
+_selector = None
+_multiplier_index = None
+
+
+def init_worker(project_data_file, multipliers_file):
+    """Process pool initializer: every worker reads the data files and builds the multiplier index once"""
+    global _selector, _multiplier_index
+    _selector = ProjectSelector(pd.read_csv(project_data_file))
+    _multiplier_index = build_multiplier_index(pd.read_csv(multipliers_file))
+
+
+def sweep_tasks(n_rows, chunk_size, plant_modes, fund_modes, opex_modes, carbon_values):
+    """(task_id, modes, start, stop) for every mode combination and every chunk of project_data rows"""
+    tasks = []
+    for modes in itertools.product(plant_modes, fund_modes, opex_modes, carbon_values):
+        for start in range(0, n_rows, chunk_size):
+            stop = min(start + chunk_size, n_rows)
+            task_id = "/".join(f"{key}={value}" for key, value in zip(("plant_mode", "fund_mode", "opex_mode", "carbon_value"), modes))
+            tasks.append((f"{task_id}/part-{start:05d}-{stop:05d}", modes, start, stop))
+    return tasks
+
+
+def run_shard(selector, multiplier, modes, start, stop):
+    """Analytics results for project_data rows [start, stop) under one mode combination, as one DataFrame"""
+    plant_mode, fund_mode, opex_mode, carbon_value = modes
+    names = KEY_COLUMNS + RESULT_COLUMNS
+    columns = {name: [] for name in names}
+
+    for position in range(start, stop):
+        data = selector.record(position)
+        for _, row in Analytics_Rows(multiplier, selector, [position], data['Country'], plant_mode, fund_mode, opex_mode, carbon_value):
+            project_life = len(row['Year'])
+            row = {**row, 'Row': position, 'Country': data['Country'], 'Main_Prod': data['Main_Prod']}
+            for name in names:
+                values = np.asarray(row[name], dtype=RESULT_DTYPES.get(name, object if name != 'Row' else np.int64))
+                columns[name].append(np.broadcast_to(values, (project_life,)))
+
+    return pd.DataFrame({name: np.concatenate(parts) if parts else np.empty(0) for name, parts in columns.items()})
+
+
+def write_shard(frame, path, output_format):
+    """Write atomically so a killed job never leaves a truncated shard behind"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    if output_format == "parquet":
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def run_task(task, out_dir, output_format):
+    """Worker entry point: compute one shard and write it to its partition directory"""
+    task_id, modes, start, stop = task
+    frame = run_shard(_selector, _multiplier_index, modes, start, stop)
+    write_shard(frame, os.path.join(out_dir, f"{task_id}.{output_format}"), output_format)
+    return task_id, len(frame)
+
+
+def read_checkpoint(path, header):
+    """Task ids already finished by a previous run with the same inputs and settings"""
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0] != header:
+        raise SystemExit(f"{path} was written for different inputs or settings; rerun with --restart to start over")
+    return {line["task"] for line in lines[1:]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the analytics model over every project_data.csv row and mode combination")
+    parser.add_argument("--project-data", default="./project_data.csv")
+    parser.add_argument("--multipliers", default="./sectorwise_multipliers.csv")
+    parser.add_argument("--out", default="./sweep_results", help="output directory for the partitioned results")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", dest="output_format")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=10, help="project_data rows per shard")
+    parser.add_argument("--plant-modes", nargs="+", default=list(PLANT_MODES), choices=PLANT_MODES)
+    parser.add_argument("--fund-modes", nargs="+", default=list(FUND_MODES), choices=FUND_MODES)
+    parser.add_argument("--opex-modes", nargs="+", default=list(OPEX_MODES), choices=OPEX_MODES)
+    parser.add_argument("--carbon-values", nargs="+", default=list(CARBON_VALUES), choices=CARBON_VALUES)
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and recompute every shard")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size <= 0 or args.workers <= 0:
+        parser.error("--chunk-size and --workers must be positive")
+    if args.output_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet requires pyarrow")
+
+    n_rows = len(pd.read_csv(args.project_data))
+    tasks = sweep_tasks(n_rows, args.chunk_size, args.plant_modes, args.fund_modes, args.opex_modes, args.carbon_values)
+
+    # The checkpoint is only valid for the same data files and shard layout
+    os.makedirs(args.out, exist_ok=True)
+    checkpoint_path = os.path.join(args.out, CHECKPOINT_FILE)
+    header = {
+        "data_version": file_version(args.project_data, args.multipliers),
+        "format": args.output_format,
+        "chunk_size": args.chunk_size,
+    }
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    # Shards whose file went missing since they were checkpointed are recomputed
+    done = {task_id for task_id in read_checkpoint(checkpoint_path, header)
+            if os.path.exists(os.path.join(args.out, f"{task_id}.{args.output_format}"))}
+    todo = [task for task in tasks if task[0] not in done]
+    n_combinations = len(args.plant_modes) * len(args.fund_modes) * len(args.opex_modes) * len(args.carbon_values)
+    print(f"{len(tasks)} shards ({n_rows} rows x {n_combinations} mode combinations), "
+          f"{len(tasks) - len(todo)} already done, {len(todo)} to run on {args.workers} workers")
+
+    new_checkpoint = not os.path.exists(checkpoint_path)
+    with open(checkpoint_path, "a") as checkpoint:
+        if new_checkpoint:
+            checkpoint.write(json.dumps(header) + "\n")
+            checkpoint.flush()
+
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(args.project_data, args.multipliers)) as pool:
+            futures = [pool.submit(run_task, task, args.out, args.output_format) for task in todo]
+            for finished, future in enumerate(as_completed(futures), start=1):
+                task_id, n_result_rows = future.result()
+                checkpoint.write(json.dumps({"task": task_id, "rows": n_result_rows}) + "\n")
+                checkpoint.flush()
+                print(f"[{finished}/{len(todo)}] {task_id}: {n_result_rows} rows ({time.perf_counter() - started:.1f}s)")
+
+    print(f"Sweep complete: results in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
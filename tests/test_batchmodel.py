@@ -0,0 +1,65 @@
+"""
+The vectorized batch engine must reproduce the scalar MicroEconomic_Model for every project row and mode branch,
+and both Breakeven_Solver methods must converge to the same prices.
+"""
+import itertools
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batchmodel import MicroEconomic_Batch, Breakeven_Solver
+from originalmodel import MicroEconomic_Model
+
+PROJECT_DATA = pd.read_csv(os.path.join(os.path.dirname(__file__), os.pardir, "project_data.csv"))
+MODES = list(itertools.product(("Green", "Brown"), ("Debt", "Equity", "Mixed"), ("Inflated", "Uninflated"), ("Yes", "No")))
+SOLVER_MODES = list(itertools.product(("Debt", "Mixed"), ("Inflated", "Uninflated"), ("Yes", "No")))
+RTOL = 1e-8
+
+OUTPUT_NAMES = ("Ps", "Pso", "Pc", "Pco", "capexContr", "opexContr", "feedContr", "utilContr", "bankContr", "taxContr",
+                "otherContr", "cshflw", "cshflw2", "Year", "project_life", "construction_prd", "Yrly_invsmt", "bank_chrg",
+                "NetRevn", "tax_pybl")
+
+
+@lru_cache(maxsize=None)
+def batch_outputs(modes):
+    return MicroEconomic_Batch(PROJECT_DATA, *modes)
+
+
+def assert_close(name, batch, scalar):
+    scalar = np.asarray(scalar, dtype=np.float64)
+    batch = np.asarray(batch, dtype=np.float64)
+    assert batch.shape == scalar.shape, name
+    # Relative error, with values near zero compared against the series' magnitude
+    scale = np.maximum(np.abs(scalar), 1e-3 * np.max(np.abs(scalar), initial=0.0) + 1e-12)
+    error = np.max(np.abs(batch - scalar) / scale, initial=0.0)
+    assert error <= RTOL, f"{name}: relative error {error:.3g}"
+
+
+@pytest.mark.parametrize("modes", MODES, ids="-".join)
+@pytest.mark.parametrize("row", range(len(PROJECT_DATA)))
+def test_micro_batch_matches_scalar_model(row, modes):
+    batch = batch_outputs(modes)
+    scalar = MicroEconomic_Model(PROJECT_DATA.iloc[row], *modes)
+    for name, batch_value, scalar_value in zip(OUTPUT_NAMES, batch, scalar):
+        if name in ("project_life", "construction_prd"):
+            assert batch_value == scalar_value, name
+            continue
+        if np.ndim(batch_value):
+            batch_value = batch_value[row]
+        assert_close(name, batch_value, scalar_value)
+
+
+@pytest.mark.parametrize("modes", SOLVER_MODES, ids="-".join)
+def test_breakeven_solver_methods_agree(modes):
+    fund_mode, opex_mode, carbon_value = modes
+    fixed_point = Breakeven_Solver(PROJECT_DATA, opex_mode, carbon_value, fund_mode=fund_mode, method="fixed_point")
+    bracket = Breakeven_Solver(PROJECT_DATA, opex_mode, carbon_value, fund_mode=fund_mode, method="bracket")
+    assert fixed_point["Converged"].all()
+    assert bracket["Converged"].all()
+    # The Illinois update converges superlinearly (about a dozen evaluations here); plain regula falsi stalls near 30
+    assert bracket["Iterations"].max() <= 20
+    for name in ("Ps", "Pso", "Pc", "Pco"):
+        assert_close(name, bracket[name], fixed_point[name])
@@ -0,0 +1,66 @@
+"""The SQLite backing of ResultCache must obey the same TTL and size limits as the in-memory LRU."""
+import sqlite3
+import types
+
+import pytest
+
+import resultcache
+from resultcache import ResultCache
+
+TTL = 60.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resultcache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def reopen(path, max_entries=3):
+    """A second cache on the same file, i.e. an empty in-memory LRU in front of the stored rows"""
+    return ResultCache(max_entries=max_entries, ttl=TTL, path=path)
+
+
+def stored_keys(path):
+    with sqlite3.connect(path) as db:
+        return {key for (key,) in db.execute("SELECT key FROM results")}
+
+
+def test_sqlite_row_survives_within_ttl(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    reopen(path).set("a", [1])
+    clock[0] += TTL - 1
+    assert reopen(path).get("a") == [1]
+
+
+def test_expired_sqlite_row_is_a_miss_and_deleted(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    reopen(path).set("a", [1])
+    clock[0] += TTL + 1
+    cache = reopen(path)
+    assert cache.get("a") is None
+    assert cache.misses == 1
+    assert stored_keys(path) == set()
+
+
+def test_set_deletes_expired_rows(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = reopen(path)
+    cache.set("old", [1])
+    clock[0] += TTL + 1
+    cache.set("new", [2])
+    assert stored_keys(path) == {"new"}
+
+
+def test_set_trims_sqlite_to_max_entries(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    cache = reopen(path, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, [key])
+        clock[0] += 1
+    assert stored_keys(path) == {"b", "c"}
+    fresh = reopen(path, max_entries=2)
+    assert fresh.get("a") is None
+    assert fresh.get("b") == ["b"]
+    assert fresh.get("c") == ["c"]